@@ -4,13 +4,20 @@ Normalizes and cleans GPU listing data from various marketplaces
 """
 
 import re
+import sys
 import logging
-from typing import Dict, Any, Optional, List, Tuple
-from dataclasses import dataclass
+import functools
+from typing import Dict, Any, Optional, List, Tuple, NamedTuple, Callable
 
+import pandas as pd
 
-@dataclass
-class GPUInfo:
+try:
+    import hyperscan
+except ImportError:  # Optional accelerator; sre handles everything without it
+    hyperscan = None
+
+
+class GPUInfo(NamedTuple):
     manufacturer: str  # NVIDIA, AMD, Intel
     series: str       # RTX 40, RX 7000, Arc
     model: str        # 4070, 7800 XT, B580
@@ -19,262 +26,447 @@ class GPUInfo:
     confidence_score: float = 0.0
 
 
+def _nvidia_model(number: str, ti_suffix: str) -> str:
+    return f'{number} Ti' if ti_suffix else number
+
+
+def _amd_model(number: str, suffix: str) -> str:
+    return f'{number} {suffix.upper()}' if suffix else number
+
+
+def _intel_model(model: str, _: str) -> str:
+    return model.upper()
+
+
+def _compile_gpu_patterns(gpu_patterns: List[Tuple[str, str, str, Any, Callable[[str, str], str]]]) -> Tuple[re.Pattern, Dict[str, tuple]]:
+    """
+    Fuse (group name, regex, manufacturer, series, model builder) entries into one regex
+    Returns the compiled pattern and a map of group name -> (manufacturer, series,
+    model builder, inner group indices)
+    """
+    pattern = re.compile('|'.join(f'(?P<{name}>{regex})' for name, regex, *_ in gpu_patterns))
+    
+    pattern_meta = {}
+    for name, regex, manufacturer, series, model_builder in gpu_patterns:
+        first_group = pattern.groupindex[name] + 1
+        group_indices = tuple(range(first_group, first_group + re.compile(regex).groups))
+        pattern_meta[name] = (manufacturer, series, model_builder, group_indices)
+    
+    return pattern, pattern_meta
+
+
+def _compile_hyperscan_database(expressions: List[str]):
+    """
+    Compile regexes into a Hyperscan block-mode database that reports match start offsets
+    Returns None when the optional hyperscan package is not installed
+    """
+    if hyperscan is None:
+        return None
+    
+    database = hyperscan.Database()
+    database.compile(
+        expressions=[expression.encode() for expression in expressions],
+        ids=list(range(len(expressions))),
+        elements=len(expressions),
+        flags=[hyperscan.HS_FLAG_SOM_LEFTMOST] * len(expressions),
+    )
+    return database
+
+
 class GPUDataStandardizer:
+    # Patterns are compiled once per process at class definition time.
+    
+    # GPU patterns: (group name, regex, manufacturer, series, model builder).
+    # Alternatives are fused into one regex so the text is scanned once; the
+    # optional brand prefixes keep e.g. "geforce rtx 4070" on the RTX 40 entry
+    # rather than the legacy catch-all. Patterns are lowercase and applied to
+    # lowercased text, so no IGNORECASE flag is needed. The model builder gets the
+    # first two groups (missing ones as ''); for NVIDIA the second group captures a
+    # "Ti" suffix. A series given as a dict is looked up by the leading digit of
+    # the model number, so each family needs only one alternative.
+    gpu_patterns = [
+        # NVIDIA RTX 50/40/30 series
+        ('nvidia', r'(?:geforce\s*)?rtx\s*(50\d{2}|[34]\d{3})(\s*ti\b)?', 'NVIDIA',
+         {'5': 'RTX 50', '4': 'RTX 40', '3': 'RTX 30'}, _nvidia_model),
+        # NVIDIA legacy patterns
+        ('nv_legacy', r'geforce\s*rtx\s*(\d{4})(\s*ti\b)?', 'NVIDIA', 'RTX', _nvidia_model),
+        # AMD RX 7000/6000 series
+        ('amd', r'(?:radeon\s*)?rx\s*([67]\d{3})\s*(xt|gre)?', 'AMD',
+         {'7': 'RX 7000', '6': 'RX 6000'}, _amd_model),
+        # Intel Arc
+        ('intel_arc', r'(?:intel\s*)?arc\s*(a\d{3}|b\d{3})', 'Intel', 'Arc', _intel_model),
+    ]
+    gpu_pattern, gpu_pattern_meta = _compile_gpu_patterns(gpu_patterns)
+    gpu_database = _compile_hyperscan_database([regex for _, regex, *_ in gpu_patterns])
+    # Every GPU pattern contains one of these literals; used as a cheap pre-check
+    gpu_keywords = ('rtx', 'rx', 'arc')
+    
+    # VRAM pattern ("12gb", "12 gb gddr6x", "16gb vram", "vram: 8gb")
+    vram_pattern = re.compile(
+        r'(?<!\d)(\d{1,2})\s*gb(?:\s*(?:gddr\d*|vram))?|vram[:\s]+(\d{1,2})\s*gb'
+    )
+    
+    # Card manufacturer patterns
+    manufacturer_patterns = {
+        'MSI': [r'\bmsi\b', r'msi\s+gaming', r'msi\s+ventus'],
+        'ASUS': [r'\basus\b', r'asus\s+rog', r'asus\s+tuf', r'asus\s+dual'],
+        'Gigabyte': [r'\bgigabyte\b', r'gigabyte\s+gaming', r'gigabyte\s+aorus'],
+        'EVGA': [r'\bevga\b', r'evga\s+ftw', r'evga\s+sc'],
+        'Sapphire': [r'\bsapphire\b', r'sapphire\s+nitro', r'sapphire\s+pulse'],
+        'PowerColor': [r'\bpowercolor\b', r'powercolor\s+red'],
+        'XFX': [r'\bxfx\b', r'xfx\s+speedster'],
+        'Zotac': [r'\bzotac\b', r'zotac\s+gaming'],
+        'Palit': [r'\bpalit\b', r'palit\s+gamerock'],
+        'Gainward': [r'\bgainward\b', r'gainward\s+phoenix'],
+        'PNY': [r'\bpny\b'],
+        'Inno3D': [r'\binno3d\b'],
+        'Manli': [r'\bmanli\b'],
+    }
+    # One alternation with a named group per brand; match.lastgroup is the brand
+    manufacturer_pattern = re.compile(
+        '|'.join(
+            f"(?P<{manufacturer}>{'|'.join(patterns)})"
+            for manufacturer, patterns in manufacturer_patterns.items()
+        )
+    )
+    # Every brand has a bare-word pattern equal to its lowercased name, so a word
+    # lookup resolves most listings without running the alternation above
+    manufacturer_tokens = {manufacturer.lower(): manufacturer for manufacturer in manufacturer_patterns}
+    word_pattern = re.compile(r'\w+')
+    
+    # Price patterns in order of preference: an amount next to a £ sign, then any number.
+    # Modifiers like "ono"/"obo" contain no digits, so they never need stripping first
+    price_patterns = (
+        re.compile(r'£\s*(\d+(?:,\d{3})*(?:\.\d{2})?)|(\d+(?:,\d{3})*(?:\.\d{2})?)\s*£'),
+        re.compile(r'(\d+(?:,\d{3})*(?:\.\d{2})?)'),
+    )
+    
+    # Map various condition descriptions to standard ones (earlier entries take priority)
+    condition_map = {
+        'new': ['new', 'brand new', 'sealed', 'unopened', 'mint'],
+        'like new': ['like new', 'excellent', 'very good', 'pristine', 'perfect'],
+        'good': ['good', 'working', 'functional', 'used - good'],
+        'fair': ['fair', 'average', 'used - fair', 'some wear'],
+        'poor': ['poor', 'damaged', 'faulty', 'for parts', 'spares']
+    }
+    # Inverted lookups: single-word variants -> (rank, standard), multi-word phrases kept for substring checks
+    condition_tokens = {
+        variant: (rank, standard.title())
+        for rank, (standard, variants) in enumerate(condition_map.items())
+        for variant in variants if ' ' not in variant
+    }
+    condition_phrases = tuple(
+        (variant, (rank, standard.title()))
+        for rank, (standard, variants) in enumerate(condition_map.items())
+        for variant in variants if ' ' in variant
+    )
+    condition_word_pattern = re.compile(r'[a-z]+')
+
+    # Relisted items and re-scrapes repeat titles often, so what a title says is
+    # cached by title, in one cache shared by every standardizer
+    title_details_cache_size = 10_000
+
     def __init__(self):
         self.logger = logging.getLogger(__name__)
+
+    def standardize_listing(self, raw_listing: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Standardize a raw listing into clean, structured data
+        """
+        # Fields are taken as text by _field_text, as in standardize_listings, so the
+        # checks below cover the bad inputs without wrapping every listing in a try/except
+        title = self._field_text(raw_listing.get('title')).strip()
+        if not title:
+            return None
         
-        # NVIDIA GPU patterns
-        self.nvidia_patterns = {
-            # RTX 50 series
-            r'rtx\s*50(\d{2})': ('NVIDIA', 'RTX 50', '50{group1}'),
-            # RTX 40 series  
-            r'rtx\s*40(\d{2})(?:\s*ti)?': ('NVIDIA', 'RTX 40', '40{group1}'),
-            r'rtx\s*4(\d{3})(?:\s*ti)?': ('NVIDIA', 'RTX 40', '4{group1}'),
-            # RTX 30 series
-            r'rtx\s*30(\d{2})(?:\s*ti)?': ('NVIDIA', 'RTX 30', '30{group1}'),
-            r'rtx\s*3(\d{3})(?:\s*ti)?': ('NVIDIA', 'RTX 30', '3{group1}'),
-            # Legacy patterns
-            r'geforce\s*rtx\s*(\d{4})(?:\s*ti)?': ('NVIDIA', 'RTX', '{group1}'),
-        }
+        description = self._field_text(raw_listing.get('description')).strip()
+        price_text = self._field_text(raw_listing.get('price')).strip()
         
-        # AMD GPU patterns
-        self.amd_patterns = {
-            # RX 7000 series
-            r'rx\s*7(\d{3})\s*(xt|gre)?': ('AMD', 'RX 7000', '7{group1}{group2}'),
-            r'radeon\s*rx\s*7(\d{3})\s*(xt|gre)?': ('AMD', 'RX 7000', '7{group1}{group2}'),
-            # RX 6000 series
-            r'rx\s*6(\d{3})\s*(xt|gre)?': ('AMD', 'RX 6000', '6{group1}{group2}'),
-            r'radeon\s*rx\s*6(\d{3})\s*(xt|gre)?': ('AMD', 'RX 6000', '6{group1}{group2}'),
-        }
+        # Extract GPU information
+        gpu_info = self.extract_gpu_info(title, description)
+        if not gpu_info or gpu_info.confidence_score < 0.3:
+            return None
         
-        # Intel GPU patterns
-        self.intel_patterns = {
-            r'arc\s*(a\d{3}|b\d{3})': ('Intel', 'Arc', '{group1}'),
-            r'intel\s*arc\s*(a\d{3}|b\d{3})': ('Intel', 'Arc', '{group1}'),
-        }
+        # Extract and clean price
+        price = self.extract_price(price_text)
+        
+        condition = self._standardize_condition(self._field_text(raw_listing.get('condition')))
         
-        # VRAM patterns
-        self.vram_patterns = [
-            r'(\d+)\s*gb\s*vram',
-            r'(\d+)\s*gb(?:\s*gddr\d*)?',
-            r'(\d+)gb',
-            r'vram:\s*(\d+)\s*gb',
+        return self._build_standardized(raw_listing, title, description, price_text, condition, gpu_info, price)
+
+    def standardize_listings(self, raw_listings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Standardize a batch of raw listings
+        Runs each regex over the whole text column with pandas instead of once per
+        listing; listings without an identifiable GPU are dropped
+        """
+        if not raw_listings:
+            return []
+        
+        # The text columns are built straight from the dicts. A DataFrame of the raw
+        # listings would turn a numeric column with gaps into floats (450 -> '450.0')
+        df = pd.DataFrame({
+            column: [self._field_text(listing.get(column)) for listing in raw_listings]
+            for column in ('title', 'description', 'price', 'condition')
+        })
+        
+        titles = df['title'].str.strip()
+        descriptions = df['description'].str.strip()
+        price_texts = df['price'].str.strip()
+        titles_lower = titles.str.lower()
+        
+        # GPU model: the named group that matched identifies the pattern entry
+        gpu_groups = self._extract_title_first(titles_lower, descriptions, self.gpu_pattern)
+        gpu_names = gpu_groups[list(self.gpu_pattern_meta)].notna()
+        matched = gpu_names.any(axis=1) & (titles != '')
+        if not matched.any():
+            return []
+        gpu_names = gpu_names[matched].idxmax(axis=1)
+        
+        # VRAM: first in-range capacity per listing, from the title or else the
+        # description. Empty pieces are left out of the concat, since pandas is
+        # changing how it treats them
+        vram = self._extract_vram_column(titles_lower[matched])
+        no_vram = gpu_names.index.difference(vram.index)
+        pieces = [
+            piece for piece in (vram, self._extract_vram_column(descriptions[no_vram].str.lower()))
+            if not piece.empty
         ]
+        if pieces:
+            vram = pd.concat(pieces)
+        
+        # Card manufacturer: the same word lookup then alternation as the single-listing
+        # path, over the title and then, where that finds none, the description
+        brands = titles_lower[matched].map(self._extract_card_manufacturer)
+        no_brand = brands.index[brands.isna()]
+        if len(no_brand):
+            brands[no_brand] = descriptions[no_brand].str.lower().map(self._extract_card_manufacturer)
         
-        # Card manufacturer patterns
-        self.manufacturer_patterns = {
-            'MSI': [r'\bmsi\b', r'msi\s+gaming', r'msi\s+ventus'],
-            'ASUS': [r'\basus\b', r'asus\s+rog', r'asus\s+tuf', r'asus\s+dual'],
-            'Gigabyte': [r'\bgigabyte\b', r'gigabyte\s+gaming', r'gigabyte\s+aorus'],
-            'EVGA': [r'\bevga\b', r'evga\s+ftw', r'evga\s+sc'],
-            'Sapphire': [r'\bsapphire\b', r'sapphire\s+nitro', r'sapphire\s+pulse'],
-            'PowerColor': [r'\bpowercolor\b', r'powercolor\s+red'],
-            'XFX': [r'\bxfx\b', r'xfx\s+speedster'],
-            'Zotac': [r'\bzotac\b', r'zotac\s+gaming'],
-            'Palit': [r'\bpalit\b', r'palit\s+gamerock'],
-            'Gainward': [r'\bgainward\b', r'gainward\s+phoenix'],
-            'PNY': [r'\bpny\b'],
-            'Inno3D': [r'\binno3d\b'],
-            'Manli': [r'\bmanli\b'],
+        prices = self._extract_prices(price_texts[matched])
+        conditions = {
+            condition: self._standardize_condition(condition)
+            for condition in df.loc[matched, 'condition'].unique()
         }
         
-        # Common price cleaning patterns
-        self.price_patterns = [
-            r'£(\d+(?:,\d{3})*(?:\.\d{2})?)',
-            r'(\d+(?:,\d{3})*(?:\.\d{2})?)\s*£',
-            r'£\s*(\d+(?:,\d{3})*(?:\.\d{2})?)',
-            r'(\d+(?:,\d{3})*(?:\.\d{2})?)',
-        ]
+        standardized_listings = []
+        for index, group_name in gpu_names.items():
+            groups = [
+                value if isinstance(value, str) else None
+                for value in gpu_groups.iloc[index, [i - 1 for i in self.gpu_pattern_meta[group_name][3]]]
+            ]
+            manufacturer, series, model = self._build_gpu_model(group_name, groups)
+            gpu_info = GPUInfo(
+                manufacturer=manufacturer,
+                series=series,
+                model=model,
+                vram=int(vram[index]) if index in vram.index else None,
+                card_manufacturer=brands[index] if isinstance(brands[index], str) else None,
+                confidence_score=0.9
+            )
+            price = prices[index]
+            standardized_listings.append(self._build_standardized(
+                raw_listings[index], titles[index], descriptions[index], price_texts[index],
+                conditions[df.at[index, 'condition']], gpu_info,
+                None if pd.isna(price) else float(price)
+            ))
+        
+        return standardized_listings
 
-    def standardize_listing(self, raw_listing: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    @staticmethod
+    def _field_text(value: Any) -> str:
         """
-        Standardize a raw listing into clean, structured data
+        A raw listing field as text: missing, None, NaN and other falsy values give
+        '', anything else (such as a numeric price from JSON) its str()
         """
-        try:
-            title = raw_listing.get('title', '').strip()
-            description = raw_listing.get('description', '').strip()
-            price_text = raw_listing.get('price', '').strip()
-            
-            if not title:
-                return None
-            
-            # Extract GPU information
-            gpu_info = self.extract_gpu_info(title, description)
-            if not gpu_info or gpu_info.confidence_score < 0.3:
-                return None
-            
-            # Extract and clean price
-            price = self.extract_price(price_text)
-            
-            # Build standardized listing
-            standardized = {
-                'title': title,
-                'description': description,
-                'price_text': price_text,
-                'standardized_price': price,
-                'gpu_manufacturer': gpu_info.manufacturer,
-                'gpu_series': gpu_info.series,
-                'gpu_model': gpu_info.model,
-                'vram_gb': gpu_info.vram,
-                'card_manufacturer': gpu_info.card_manufacturer,
-                'confidence_score': gpu_info.confidence_score,
-                'url': raw_listing.get('url'),
-                'marketplace': raw_listing.get('marketplace', raw_listing.get('source')),
-                'scraped_at': raw_listing.get('scraped_at'),
-                'listing_type': raw_listing.get('listing_type'),
-                'condition': self._standardize_condition(raw_listing.get('condition', '')),
-                'location': raw_listing.get('location'),
-                'seller_info': raw_listing.get('seller_info'),
-                'is_sold': raw_listing.get('is_sold', False),
-                'is_featured': raw_listing.get('is_featured', False),
-                'shipping': raw_listing.get('shipping'),
-                'posted_date': raw_listing.get('posted_date'),
-                'image_url': raw_listing.get('image_url')
-            }
-            
-            return standardized
-            
-        except Exception as e:
-            self.logger.error(f"Failed to standardize listing: {e}")
-            return None
+        if value is None or (isinstance(value, float) and value != value):
+            return ''
+        return str(value or '')
+
+    def _extract_title_first(self, titles: pd.Series, descriptions: pd.Series, pattern: re.Pattern) -> pd.DataFrame:
+        """str.extract over lowercased titles, scanning descriptions only where the title has no match"""
+        groups = titles.str.extract(pattern)
+        missing = groups.isna().all(axis=1)
+        if missing.any():
+            groups.loc[missing] = descriptions[missing].str.lower().str.extract(pattern)
+        return groups
+
+    def _extract_vram_column(self, texts: pd.Series) -> pd.Series:
+        """Column-wise equivalent of _extract_vram; listings without VRAM are left out"""
+        if texts.empty:
+            return pd.Series(dtype=int)
+        
+        matches = texts.str.extractall(self.vram_pattern)
+        values = matches[0].fillna(matches[1]).astype(int)
+        return values[values.between(1, 24)].groupby(level=0).first()
+
+    def _extract_prices(self, price_texts: pd.Series) -> pd.Series:
+        """Column-wise equivalent of extract_price"""
+        prices = pd.Series(float('nan'), index=price_texts.index)
+        for pattern in self.price_patterns:
+            # The amount is in whichever group matched. Groups are kept as pandas
+            # strings so combining them never downcasts an all-missing column
+            groups = price_texts.str.extract(pattern).astype('string')
+            amounts = groups[0]
+            for column in groups.columns[1:]:
+                amounts = amounts.fillna(groups[column])
+            candidates = pd.to_numeric(
+                amounts.str.replace(',', '', regex=False), errors='coerce'
+            ).astype(float)
+            # Sanity check (reasonable GPU price range); earlier patterns win
+            prices = prices.fillna(candidates.where(candidates.between(10, 10000)))
+        
+        return prices
+
+    def _build_standardized(self, raw_listing: Dict[str, Any], title: str, description: str, price_text: str,
+                            condition: str, gpu_info: GPUInfo, price: Optional[float]) -> Dict[str, Any]:
+        """Build the standardized listing dict"""
+        return {
+            'title': title,
+            'description': description,
+            'price_text': price_text,
+            'standardized_price': price,
+            'gpu_manufacturer': gpu_info.manufacturer,
+            'gpu_series': gpu_info.series,
+            'gpu_model': gpu_info.model,
+            'vram_gb': gpu_info.vram,
+            'card_manufacturer': gpu_info.card_manufacturer,
+            'confidence_score': gpu_info.confidence_score,
+            'url': raw_listing.get('url'),
+            'marketplace': raw_listing.get('marketplace', raw_listing.get('source')),
+            'scraped_at': raw_listing.get('scraped_at'),
+            'listing_type': raw_listing.get('listing_type'),
+            'condition': condition,
+            'location': raw_listing.get('location'),
+            'seller_info': raw_listing.get('seller_info'),
+            'is_sold': raw_listing.get('is_sold', False),
+            'is_featured': raw_listing.get('is_featured', False),
+            'shipping': raw_listing.get('shipping'),
+            'posted_date': raw_listing.get('posted_date'),
+            'image_url': raw_listing.get('image_url')
+        }
 
     def extract_gpu_info(self, title: str, description: str = "") -> Optional[GPUInfo]:
         """
         Extract GPU information from title and description
         """
-        text = f"{title} {description}".lower()
+        # Model details are almost always in the title, so the (often much longer)
+        # description is only lowercased and scanned for whatever the title lacks
+        gpu_match, vram, card_manufacturer = self._title_details(title)
+        description_lower = None
         
-        # Try NVIDIA patterns
-        gpu_info = self._match_nvidia_patterns(text)
-        if gpu_info:
-            return gpu_info
-            
-        # Try AMD patterns
-        gpu_info = self._match_amd_patterns(text)
-        if gpu_info:
-            return gpu_info
-            
-        # Try Intel patterns
-        gpu_info = self._match_intel_patterns(text)
-        if gpu_info:
-            return gpu_info
+        if not gpu_match:
+            description_lower = description.lower()
+            gpu_match = self._match_gpu(description_lower)
+            if not gpu_match:
+                return None
         
-        return None
-
-    def _match_nvidia_patterns(self, text: str) -> Optional[GPUInfo]:
-        """Match NVIDIA GPU patterns"""
-        for pattern, (manufacturer, series, model_template) in self.nvidia_patterns.items():
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                # Build model name from template
-                model = model_template.format(
-                    group1=match.group(1) if match.lastindex >= 1 else '',
-                    group2=match.group(2) if match.lastindex >= 2 else ''
-                ).strip()
-                
-                # Handle TI variants
-                if 'ti' in text:
-                    model += ' Ti'
-                
-                gpu_info = GPUInfo(
-                    manufacturer=manufacturer,
-                    series=series,
-                    model=model,
-                    confidence_score=0.9
-                )
-                
-                # Extract additional info
-                gpu_info.vram = self._extract_vram(text)
-                gpu_info.card_manufacturer = self._extract_card_manufacturer(text)
-                
-                return gpu_info
+        if vram is None or card_manufacturer is None:
+            if description_lower is None:
+                description_lower = description.lower()
+            if vram is None:
+                vram = self._extract_vram(description_lower)
+            if card_manufacturer is None:
+                card_manufacturer = self._extract_card_manufacturer(description_lower)
         
-        return None
+        manufacturer, series, model = gpu_match
+        return GPUInfo(
+            manufacturer=manufacturer,
+            series=series,
+            model=model,
+            vram=vram,
+            card_manufacturer=card_manufacturer,
+            confidence_score=0.9
+        )
 
-    def _match_amd_patterns(self, text: str) -> Optional[GPUInfo]:
-        """Match AMD GPU patterns"""
-        for pattern, (manufacturer, series, model_template) in self.amd_patterns.items():
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                model = model_template.format(
-                    group1=match.group(1) if match.lastindex >= 1 else '',
-                    group2=f" {match.group(2).upper()}" if match.lastindex >= 2 and match.group(2) else ''
-                ).strip()
-                
-                gpu_info = GPUInfo(
-                    manufacturer=manufacturer,
-                    series=series,
-                    model=model,
-                    confidence_score=0.9
-                )
-                
-                gpu_info.vram = self._extract_vram(text)
-                gpu_info.card_manufacturer = self._extract_card_manufacturer(text)
-                
-                return gpu_info
+    @classmethod
+    @functools.lru_cache(maxsize=title_details_cache_size)
+    def _title_details(cls, title: str) -> Tuple[Optional[Tuple[str, str, str]], Optional[int], Optional[str]]:
+        """GPU model, VRAM and card manufacturer named in a title, each None if absent"""
+        title_lower = title.lower()
+        return (
+            cls._match_gpu(title_lower),
+            cls._extract_vram(title_lower),
+            cls._extract_card_manufacturer(title_lower)
+        )
+
+    @classmethod
+    def _match_gpu(cls, text: str) -> Optional[Tuple[str, str, str]]:
+        """
+        Match NVIDIA, AMD and Intel GPU patterns in a single pass
+        Returns (manufacturer, series, model) or None
+        """
+        # Substring triage is far cheaper than running the regex over a non-GPU listing
+        if not any(keyword in text for keyword in cls.gpu_keywords):
+            return None
         
-        return None
+        if cls.gpu_database is not None and text.isascii():
+            # Hyperscan reports every match start in one automaton pass, so sre only
+            # has to match at the leftmost one to recover the groups. Byte offsets
+            # equal str offsets for ASCII text, and sre's Unicode \s/\d agree there too
+            starts = []
+            cls.gpu_database.scan(text.encode(), match_event_handler=lambda *event: starts.append(event[1]))
+            if not starts:
+                return None
+            match = cls.gpu_pattern.match(text, min(starts))
+        else:
+            match = cls.gpu_pattern.search(text)
+        if not match:
+            return None
+        
+        group_indices = cls.gpu_pattern_meta[match.lastgroup][3]
+        return cls._build_gpu_model(match.lastgroup, [match.group(index) for index in group_indices])
 
-    def _match_intel_patterns(self, text: str) -> Optional[GPUInfo]:
-        """Match Intel GPU patterns"""
-        for pattern, (manufacturer, series, model_template) in self.intel_patterns.items():
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                model = model_template.format(
-                    group1=match.group(1).upper() if match.lastindex >= 1 else ''
-                ).strip()
-                
-                gpu_info = GPUInfo(
-                    manufacturer=manufacturer,
-                    series=series,
-                    model=model,
-                    confidence_score=0.9
-                )
-                
-                gpu_info.vram = self._extract_vram(text)
-                gpu_info.card_manufacturer = self._extract_card_manufacturer(text)
-                
-                return gpu_info
+    @classmethod
+    def _build_gpu_model(cls, group_name: str, groups: List[Optional[str]]) -> Tuple[str, str, str]:
+        """Format (manufacturer, series, model) from a matched GPU pattern's groups"""
+        manufacturer, series, model_builder, _ = cls.gpu_pattern_meta[group_name]
+        group1 = (groups[0] if groups else None) or ''
+        group2 = (groups[1] if len(groups) > 1 else None) or ''
+        if isinstance(series, dict):
+            series = series[group1[0]]
         
-        return None
+        model = model_builder(group1, group2)
+        
+        # Manufacturer and series already come from shared metadata; interning the
+        # model lets every listing of the same card hold one string object too
+        return manufacturer, series, sys.intern(model)
 
-    def _extract_vram(self, text: str) -> Optional[int]:
+    @classmethod
+    def _extract_vram(cls, text: str) -> Optional[int]:
         """Extract VRAM amount in GB"""
-        for pattern in self.vram_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                try:
-                    vram = int(match.group(1))
-                    # Sanity check (GPUs typically have 1-24GB VRAM)
-                    if 1 <= vram <= 24:
-                        return vram
-                except ValueError:
-                    continue
+        for match in cls.vram_pattern.finditer(text):
+            vram = int(match.group(1) or match.group(2))
+            # Sanity check (GPUs typically have 1-24GB VRAM)
+            if 1 <= vram <= 24:
+                return vram
         return None
 
-    def _extract_card_manufacturer(self, text: str) -> Optional[str]:
+    @classmethod
+    def _extract_card_manufacturer(cls, text: str) -> Optional[str]:
         """Extract graphics card manufacturer"""
-        for manufacturer, patterns in self.manufacturer_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, text, re.IGNORECASE):
-                    return manufacturer
-        return None
+        for word in cls.word_pattern.finditer(text):
+            manufacturer = cls.manufacturer_tokens.get(word.group())
+            if manufacturer:
+                return manufacturer
+        
+        # Phrase patterns (e.g. "msi gaming") can still match without word boundaries,
+        # but every one contains its brand name, so a substring test rules most text out
+        if not any(token in text for token in cls.manufacturer_tokens):
+            return None
+        match = cls.manufacturer_pattern.search(text)
+        return match.lastgroup if match else None
 
     def extract_price(self, price_text: str) -> Optional[float]:
         """Extract numeric price from text"""
         if not price_text:
             return None
         
-        # Remove common price modifiers
-        cleaned = re.sub(r'(ono|or best offer|obo|neg|negotiable)', '', price_text.lower())
-        
         # Try price patterns in order of preference
         for pattern in self.price_patterns:
-            match = re.search(pattern, cleaned)
+            match = pattern.search(price_text)
             if match:
                 try:
-                    price_str = match.group(1).replace(',', '')
-                    price = float(price_str)
+                    price = float(match[match.lastindex].replace(',', ''))
                     
                     # Sanity check (reasonable GPU price range)
                     if 10 <= price <= 10000:
@@ -321,23 +513,21 @@ class GPUDataStandardizer:
         if not condition:
             return 'Unknown'
         
-        condition_lower = condition.lower().strip()
+        condition_lower = condition.lower()
         
-        # Map various condition descriptions to standard ones
-        condition_map = {
-            'new': ['new', 'brand new', 'sealed', 'unopened', 'mint'],
-            'like new': ['like new', 'excellent', 'very good', 'pristine', 'perfect'],
-            'good': ['good', 'working', 'functional', 'used - good'],
-            'fair': ['fair', 'average', 'used - fair', 'some wear'],
-            'poor': ['poor', 'damaged', 'faulty', 'for parts', 'spares']
-        }
+        # Collect every standard condition a variant points at; the lowest rank wins,
+        # matching the priority order of condition_map
+        words = set(self.condition_word_pattern.findall(condition_lower))
+        candidates = [self.condition_tokens[word] for word in words & self.condition_tokens.keys()]
+        candidates.extend(
+            entry for phrase, entry in self.condition_phrases if phrase in condition_lower
+        )
         
-        for standard_condition, variants in condition_map.items():
-            for variant in variants:
-                if variant in condition_lower:
-                    return standard_condition.title()
+        if candidates:
+            return min(candidates)[1]
         
-        return condition.title()
+        # Marketplaces use a small fixed set of condition labels, so share them
+        return sys.intern(condition.title())
 
     def get_standardization_stats(self, listings: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -347,10 +537,21 @@ class GPUDataStandardizer:
             return {}
         
         total_listings = len(listings)
-        price_extracted = sum(1 for listing in listings if listing.get('standardized_price'))
-        gpu_identified = sum(1 for listing in listings if listing.get('gpu_model'))
-        vram_extracted = sum(1 for listing in listings if listing.get('vram_gb'))
-        manufacturer_identified = sum(1 for listing in listings if listing.get('card_manufacturer'))
+        price_extracted = gpu_identified = vram_extracted = manufacturer_identified = 0
+        confidence_total = 0.0
+        
+        # Single pass over the listings rather than one generator per statistic
+        for listing in listings:
+            get = listing.get
+            if get('standardized_price'):
+                price_extracted += 1
+            if get('gpu_model'):
+                gpu_identified += 1
+            if get('vram_gb'):
+                vram_extracted += 1
+            if get('card_manufacturer'):
+                manufacturer_identified += 1
+            confidence_total += get('confidence_score', 0)
         
         return {
             'total_listings': total_listings,
@@ -358,9 +559,7 @@ class GPUDataStandardizer:
             'gpu_identification_rate': round(gpu_identified / total_listings * 100, 1),
             'vram_extraction_rate': round(vram_extracted / total_listings * 100, 1),
             'manufacturer_identification_rate': round(manufacturer_identified / total_listings * 100, 1),
-            'avg_confidence_score': round(
-                sum(listing.get('confidence_score', 0) for listing in listings) / total_listings, 2
-            )
+            'avg_confidence_score': round(confidence_total / total_listings, 2)
         }
 
 
@@ -3,55 +3,143 @@ Excel Export Module
 Exports GPU listing data to Excel format with multiple sheets and formatting
 """
 
-import pandas as pd
+import csv
+import asyncio
+import numpy as np
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Iterable, Tuple, NamedTuple
 import logging
+import itertools
+import warnings
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils.dataframe import dataframe_to_rows
-from openpyxl.worksheet.table import Table, TableStyleInfo
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, NamedStyle
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.table import Table, TableColumn, TableStyleInfo
+from openpyxl.xml import LXML
+
+try:
+    import pyexcelerate
+except ImportError:  # Optional faster writer, selected with engine="pyexcelerate"
+    pyexcelerate = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Optional, only needed for export_to_parquet
+    pa = pq = None
+
+
+class SheetData(NamedTuple):
+    """Contents of one worksheet, independent of the library that writes it"""
+    name: str
+    rows: Iterable[Tuple[List[Any], Optional[str]]]  # (values, cell style applied to the row's values)
+    column_widths: Dict[int, float]
+    table: Optional[Tuple[str, str, List[str]]] = None  # (display name, range, column names)
+
+
+@dataclass
+class Aggregates:
+    """Per-export counts and prices, gathered one listing at a time by _accumulate"""
+    marketplace_counts: Counter = field(default_factory=Counter)
+    gpu_models: Counter = field(default_factory=Counter)
+    conditions: Counter = field(default_factory=Counter)
+    prices_by_model: Dict[str, List[float]] = field(default_factory=dict)  # standardized prices only
+    all_prices: np.ndarray = field(default_factory=lambda: np.empty(0))  # standardized price, else raw price
 
 
 class ExcelExporter:
-    def __init__(self, output_dir: str = "output"):
+    # Listing fields written first on the listings sheet; any other keys follow
+    standard_columns = [
+        'title', 'marketplace', 'price', 'standardized_price', 'gpu_model', 
+        'gpu_series', 'condition', 'location', 'url', 'posted_date', 
+        'seller_info', 'is_sold', 'is_featured', 'scraped_at'
+    ]
+    
+    # Cell styles used by the sheets, shared by both writers
+    cell_styles = {
+        "Listings Header": {'bold': True, 'color': "FFFFFF", 'fill': "366092", 'center': True},
+        "Report Title": {'bold': True, 'size': 16, 'color': "FFFFFF", 'fill': "366092"},
+        "Sheet Title": {'bold': True, 'size': 14},
+        "Section Heading": {'bold': True},
+        "Compliance Header": {'bold': True, 'fill': "D9E1F2"},
+        "Price Header": {'bold': True, 'fill': "E2EFDA"},
+    }
+    
+    engines = ('openpyxl', 'pyexcelerate')
+    write_buffer_size = 4 * 1024 * 1024
+    
+    # Streamed listings sheets can't be measured before their rows are written
+    stream_column_width = 20
+    
+    # Low-cardinality listing fields worth dictionary encoding in Parquet
+    dictionary_columns = ['marketplace', 'gpu_manufacturer', 'gpu_model', 'gpu_series', 'condition']
+
+    def __init__(self, output_dir: str = "output", engine: str = "openpyxl",
+                 timestamp: Optional[datetime] = None):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
         self.logger = logging.getLogger(__name__)
+        
+        # Each export takes the time once when it starts, so its file name and report
+        # date agree and a reused exporter doesn't overwrite its earlier files. A
+        # timestamp passed here is used for every export instead
+        self.timestamp = timestamp
+        
+        if engine not in self.engines:
+            raise ValueError(f"Unknown Excel engine: {engine}")
+        if engine == "pyexcelerate" and pyexcelerate is None:
+            self.logger.warning("pyexcelerate not installed; falling back to openpyxl for Excel export")
+            engine = "openpyxl"
+        self.engine = engine
+        
+        # openpyxl streams cells through lxml when it is importable; without it every
+        # cell goes through the much slower pure-Python ElementTree writer on save
+        if engine == "openpyxl":
+            if LXML:
+                self.logger.debug("openpyxl is using lxml for XML serialization")
+            else:
+                self.logger.warning("lxml not available; Excel export will use the slower ElementTree writer")
+        
+        # Style objects are built once per exporter and reused for every export
+        self.styles = self._build_styles()
 
     def export_to_excel(self, listings: List[Dict[str, Any]], 
                        compliance_results: Dict[str, Dict[str, Any]] = None) -> str:
         """
         Export GPU listings to Excel with multiple sheets
         """
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"gpu_listings_{timestamp}.xlsx"
-        filepath = self.output_dir / filename
+        timestamp = self._export_timestamp()
+        filepath = self.output_dir / f"gpu_listings_{timestamp:%Y%m%d_%H%M%S}.xlsx"
         
         try:
-            # Create workbook and sheets
-            wb = Workbook()
-            
-            # Remove default sheet
-            if 'Sheet' in wb.sheetnames:
-                wb.remove(wb['Sheet'])
-            
             # Create main listings sheet
-            self._create_listings_sheet(wb, listings)
+            sheets = [self._create_listings_sheet(listings)]
             
-            # Create summary sheet
-            self._create_summary_sheet(wb, listings)
+            # An empty scrape gets just the placeholder sheet (and the compliance
+            # results, which explain most empty runs); there is nothing to summarise
+            if listings:
+                aggregates = self._aggregate(listings)
+                
+                # Create summary sheet
+                sheets.append(self._create_summary_sheet(len(listings), aggregates, timestamp))
             
             # Create compliance sheet if data provided
             if compliance_results:
-                self._create_compliance_sheet(wb, compliance_results)
+                sheets.append(self._create_compliance_sheet(compliance_results))
             
             # Create price analysis sheet
-            self._create_price_analysis_sheet(wb, listings)
+            if listings:
+                sheets.append(self._create_price_analysis_sheet(len(listings), aggregates))
             
             # Save workbook
-            wb.save(filepath)
+            if self.engine == "pyexcelerate":
+                self._save_pyexcelerate(filepath, sheets)
+            else:
+                self._save_openpyxl(filepath, sheets)
             
             self.logger.info(f"Exported {len(listings)} listings to {filepath}")
             return str(filepath)
@@ -60,267 +148,416 @@ class ExcelExporter:
             self.logger.error(f"Failed to export to Excel: {e}")
             raise
 
-    def _create_listings_sheet(self, wb: Workbook, listings: List[Dict[str, Any]]) -> None:
-        """Create the main listings data sheet"""
-        ws = wb.create_sheet("GPU Listings", 0)
-        
-        if not listings:
-            ws['A1'] = "No listings found"
-            return
-        
-        # Convert to DataFrame for easier manipulation
-        df = pd.DataFrame(listings)
-        
-        # Standardize columns
-        standard_columns = [
-            'title', 'marketplace', 'price', 'standardized_price', 'gpu_model', 
-            'gpu_series', 'condition', 'location', 'url', 'posted_date', 
-            'seller_info', 'is_sold', 'is_featured', 'scraped_at'
-        ]
-        
-        # Ensure all standard columns exist
-        for col in standard_columns:
-            if col not in df.columns:
-                df[col] = None
-        
-        # Reorder columns
-        existing_cols = [col for col in standard_columns if col in df.columns]
-        extra_cols = [col for col in df.columns if col not in standard_columns]
-        df = df[existing_cols + extra_cols]
-        
-        # Add data to worksheet
-        for r in dataframe_to_rows(df, index=False, header=True):
-            ws.append(r)
-        
-        # Format the sheet
-        self._format_listings_sheet(ws, len(df))
-
-    def _format_listings_sheet(self, ws, num_rows: int) -> None:
-        """Apply formatting to the listings sheet"""
-        # Header formatting
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        
-        for cell in ws[1]:
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = Alignment(horizontal="center")
+    async def export_stream(self, queue: asyncio.Queue,
+                            compliance_results: Dict[str, Dict[str, Any]] = None) -> str:
+        """
+        Export listings to Excel as they arrive on a queue, ending at a None sentinel
+        Listings are written to the sheet and dropped straight away, so memory stays
+        bounded by the queue size. Only standard_columns are written, since the
+        columns have to be fixed before the first row. Always uses openpyxl
+        """
+        timestamp = self._export_timestamp()
+        filepath = self.output_dir / f"gpu_listings_{timestamp:%Y%m%d_%H%M%S}.xlsx"
         
-        # Auto-adjust column widths
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
+        try:
+            wb = Workbook(write_only=True)
+            self._register_styles(wb)
+            
+            columns = self.standard_columns
+            ws = wb.create_sheet("GPU Listings")
+            for col, column in enumerate(columns, 1):
+                ws.column_dimensions[get_column_letter(col)].width = self.stream_column_width
+            ws.append([self._styled_cell(ws, column, "Listings Header") for column in columns])
             
-            for cell in column:
+            aggregates = Aggregates()
+            all_prices = []
+            total = 0
+            while True:
+                listing = await queue.get()
                 try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
+                    if listing is None:
+                        break
+                    ws.append(list(map(listing.get, columns)))
+                    self._accumulate(aggregates, all_prices, listing)
+                    total += 1
+                finally:
+                    queue.task_done()
+            aggregates.all_prices = np.asarray(all_prices, dtype=np.float64)
+            
+            if total:
+                self._add_table(ws, "GPUListings", f"A1:{get_column_letter(len(columns))}{total + 1}", columns)
             
-            adjusted_width = min(max_length + 2, 50)  # Cap at 50 characters
-            ws.column_dimensions[column_letter].width = adjusted_width
-        
-        # Add table formatting
-        if num_rows > 0:
-            table_range = f"A1:{ws.max_column_letter}{num_rows + 1}"
-            table = Table(displayName="GPUListings", ref=table_range)
-            table.tableStyleInfo = TableStyleInfo(
-                name="TableStyleMedium9", showFirstColumn=False,
-                showLastColumn=False, showRowStripes=True, showColumnStripes=True
+            sheets = [self._create_summary_sheet(total, aggregates, timestamp)]
+            if compliance_results:
+                sheets.append(self._create_compliance_sheet(compliance_results))
+            sheets.append(self._create_price_analysis_sheet(total, aggregates))
+            for sheet in sheets:
+                self._write_openpyxl_sheet(wb, sheet)
+            
+            with self._open_output(filepath) as f:
+                wb.save(f)
+            
+            self.logger.info(f"Exported {total} streamed listings to {filepath}")
+            return str(filepath)
+            
+        except Exception as e:
+            self.logger.error(f"Failed to export stream to Excel: {e}")
+            raise
+
+    def _export_timestamp(self) -> datetime:
+        """The timestamp passed to the constructor, or else the current time"""
+        return self.timestamp or datetime.now()
+
+    def _accumulate(self, aggregates: Aggregates, all_prices: List[float], listing: Dict[str, Any]) -> None:
+        """Add one listing to running aggregates; finish with all_prices as an array"""
+        get = listing.get
+        model = get('gpu_model', 'Unknown')
+        aggregates.marketplace_counts[get('marketplace', 'Unknown')] += 1
+        aggregates.gpu_models[model] += 1
+        aggregates.conditions[get('condition', 'Unknown')] += 1
+        
+        standardized_price = get('standardized_price')
+        if isinstance(standardized_price, (int, float)) and standardized_price > 0:
+            aggregates.prices_by_model.setdefault(model, []).append(standardized_price)
+        
+        price = standardized_price or get('price')
+        if isinstance(price, (int, float)) and price > 0:
+            all_prices.append(price)
+
+    def _build_styles(self) -> Dict[str, Any]:
+        """
+        Build the engine's style objects for cell_styles
+        openpyxl gets (font, fill, alignment) to register as named styles on each
+        workbook; PyExcelerate gets ready-made Style objects
+        """
+        styles = {}
+        for name, style in self.cell_styles.items():
+            if self.engine == "pyexcelerate":
+                styles[name] = pyexcelerate.Style(
+                    font=pyexcelerate.Font(
+                        bold=style.get('bold', False),
+                        size=style.get('size', 11),
+                        color=pyexcelerate.Color(*bytes.fromhex(style['color'])) if 'color' in style else None
+                    ),
+                    fill=pyexcelerate.Fill(background=pyexcelerate.Color(*bytes.fromhex(style['fill']))) if 'fill' in style else None,
+                    alignment=pyexcelerate.Alignment(horizontal="center") if style.get('center') else None
+                )
+            else:
+                styles[name] = (
+                    Font(bold=style.get('bold', False), size=style.get('size'), color=style.get('color')),
+                    PatternFill(start_color=style['fill'], end_color=style['fill'], fill_type="solid") if 'fill' in style else PatternFill(),
+                    Alignment(horizontal="center") if style.get('center') else Alignment()
+                )
+        return styles
+
+    def _register_styles(self, wb: Workbook) -> None:
+        """Register the named cell styles on an openpyxl workbook"""
+        for name, (font, fill, alignment) in self.styles.items():
+            wb.add_named_style(NamedStyle(name=name, font=font, fill=fill, alignment=alignment))
+
+    def _save_openpyxl(self, filepath: Path, sheets: List[SheetData]) -> None:
+        """Write sheets with openpyxl"""
+        # Write-only workbooks stream rows to disk instead of keeping every
+        # cell in memory. Rows can only be appended, so column widths and
+        # styles have to be known before a sheet's first row is written
+        wb = Workbook(write_only=True)
+        self._register_styles(wb)
+        
+        for sheet in sheets:
+            self._write_openpyxl_sheet(wb, sheet)
+        
+        with self._open_output(filepath) as f:
+            wb.save(f)
+
+    def _write_openpyxl_sheet(self, wb: Workbook, sheet: SheetData):
+        """Append one sheet to a write-only openpyxl workbook"""
+        ws = wb.create_sheet(sheet.name)
+        for col, width in sheet.column_widths.items():
+            ws.column_dimensions[get_column_letter(col)].width = width
+        
+        for values, style in sheet.rows:
+            if style:
+                values = [self._styled_cell(ws, value, style) for value in values]
+            ws.append(values)
+        
+        if sheet.table:
+            self._add_table(ws, *sheet.table)
+        return ws
+
+    def _add_table(self, ws, display_name: str, ref: str, column_names: List[str]) -> None:
+        """Add a striped table over a range of a write-only sheet"""
+        # A write-only sheet can't read its header row back, so the table
+        # columns are given here
+        table = Table(displayName=display_name, ref=ref, tableColumns=[
+            TableColumn(id=column_id, name=column_name)
+            for column_id, column_name in enumerate(column_names, 1)
+        ])
+        table.tableStyleInfo = TableStyleInfo(
+            name="TableStyleMedium9", showFirstColumn=False,
+            showLastColumn=False, showRowStripes=True, showColumnStripes=True
+        )
+        with warnings.catch_warnings():
+            # openpyxl reminds us to add the columns, which we have, on every
+            # write-only add_table; any other warning still gets through
+            warnings.filterwarnings(
+                "ignore", message="In write-only mode you must add table columns manually", category=UserWarning
             )
             ws.add_table(table)
 
-    def _create_summary_sheet(self, wb: Workbook, listings: List[Dict[str, Any]]) -> None:
-        """Create summary statistics sheet"""
-        ws = wb.create_sheet("Summary")
+    def _save_pyexcelerate(self, filepath: Path, sheets: List[SheetData]) -> None:
+        """
+        Write sheets with PyExcelerate, which emits rows straight to XML without
+        building per-cell objects. It has no table support, so the listings
+        sheet is written without the table overlay
+        """
+        wb = pyexcelerate.Workbook()
+        for sheet in sheets:
+            data = []
+            styled_rows = []
+            for row_number, (values, style) in enumerate(sheet.rows, 1):
+                data.append(values)
+                if style:
+                    styled_rows.append((row_number, len(values), self.styles[style]))
+            
+            ws = wb.new_sheet(sheet.name, data=data)
+            for col, width in sheet.column_widths.items():
+                ws.set_col_style(col, pyexcelerate.Style(size=width))
+            for row_number, length, style in styled_rows:
+                for col in range(1, length + 1):
+                    ws.set_cell_style(row_number, col, style)
+        
+        with self._open_output(filepath) as f:
+            wb.save(f)
+
+    def _aggregate(self, listings: List[Dict[str, Any]]) -> Aggregates:
+        """
+        Count marketplaces, models and conditions and collect prices
+        A fold over _accumulate, so batch and streamed exports count the same way
+        """
+        aggregates = Aggregates()
+        all_prices = []
+        for listing in listings:
+            self._accumulate(aggregates, all_prices, listing)
+        aggregates.all_prices = np.asarray(all_prices, dtype=np.float64)
+        return aggregates
+
+    def _price_stats(self, prices: List[float]) -> Tuple[float, float, float]:
+        """Return (average, min, max) of a non-empty price list using NumPy reductions"""
+        prices_arr = np.asarray(prices, dtype=np.float64)
+        return float(prices_arr.mean()), float(prices_arr.min()), float(prices_arr.max())
+
+    def _open_output(self, filepath: Path):
+        """
+        Open the xlsx output with a large write buffer, so the zip writer's many
+        small writes reach the disk as a few big ones without holding the whole
+        file in memory
+        """
+        return open(filepath, 'wb', buffering=self.write_buffer_size)
+
+    def _styled_cell(self, ws, value: Any, style: str) -> WriteOnlyCell:
+        """Create a write-only cell with a registered named style"""
+        cell = WriteOnlyCell(ws, value=value)
+        cell.style = style
+        return cell
+
+    def _column_widths(self, rows: List[List[Any]], max_width: int) -> Dict[int, float]:
+        """Size columns to their longest value"""
+        widths = {}
+        for row in rows:
+            for col, value in enumerate(row, 1):
+                if value is not None:
+                    widths[col] = max(widths.get(col, 0), len(str(value)))
+        
+        return {col: min(width + 2, max_width) for col, width in widths.items()}
+
+    def _create_listings_sheet(self, listings: List[Dict[str, Any]]) -> SheetData:
+        """Create the main listings data sheet"""
+        if not listings:
+            return SheetData("GPU Listings", [(["No listings found"], None)], {})
         
+        # Standard columns first, then any other keys in first-seen order. Widths come
+        # from the same pass over each listing's own items, and a column stops being
+        # measured once it reaches the 50 character cap
+        width_cap = 48
+        widths = {column: len(column) for column in self.standard_columns}
+        for listing in listings:
+            for key, value in listing.items():
+                width = widths.get(key)
+                if width is None:
+                    widths[key] = width = len(key)
+                if value is not None and width < width_cap:
+                    value_width = len(value) if isinstance(value, str) else len(str(value))
+                    if value_width > width:
+                        widths[key] = value_width
+        
+        columns = list(widths)
+        column_widths = {col: min(width + 2, 50) for col, width in enumerate(widths.values(), 1)}  # Cap at 50 characters
+        
+        # Rows are generated lazily so the writer can stream them. map() over the
+        # listing's bound get does the per-field lookups in C; itemgetter would be
+        # similar but raises on the fields a listing doesn't have
+        rows = itertools.chain(
+            [(columns, "Listings Header")],
+            ((list(map(listing.get, columns)), None) for listing in listings)
+        )
+        table_range = f"A1:{get_column_letter(len(columns))}{len(listings) + 1}"
+        
+        return SheetData("GPU Listings", rows, column_widths, ("GPUListings", table_range, columns))
+
+    def _create_summary_sheet(self, total_listings: int, aggregates: Aggregates,
+                              timestamp: datetime) -> SheetData:
+        """Create summary statistics sheet"""
         # Title
-        ws['A1'] = "GPU Scraper Summary Report"
-        ws['A1'].font = Font(size=16, bold=True)
-        ws['A1'].fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        ws['A1'].font = Font(size=16, bold=True, color="FFFFFF")
+        rows = [(["GPU Scraper Summary Report"], "Report Title"), ([], None)]
         
         # Basic statistics
-        row = 3
-        ws[f'A{row}'] = "Total Listings Found:"
-        ws[f'B{row}'] = len(listings)
-        
-        row += 1
-        ws[f'A{row}'] = "Scraping Date:"
-        ws[f'B{row}'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
-        # Marketplace breakdown
-        if listings:
-            marketplace_counts = {}
-            price_data = []
-            gpu_models = {}
-            
-            for listing in listings:
-                # Count by marketplace
-                marketplace = listing.get('marketplace', 'Unknown')
-                marketplace_counts[marketplace] = marketplace_counts.get(marketplace, 0) + 1
-                
-                # Collect price data
-                price = listing.get('standardized_price') or listing.get('price')
-                if isinstance(price, (int, float)) and price > 0:
-                    price_data.append(price)
-                
-                # Count GPU models
-                model = listing.get('gpu_model', 'Unknown')
-                gpu_models[model] = gpu_models.get(model, 0) + 1
+        rows.append((["Total Listings Found:", total_listings], None))
+        rows.append((["Scraping Date:", timestamp.strftime("%Y-%m-%d %H:%M:%S")], None))
+        
+        if total_listings:
+            price_data = aggregates.all_prices
             
             # Marketplace breakdown
-            row += 2
-            ws[f'A{row}'] = "Listings by Marketplace:"
-            ws[f'A{row}'].font = Font(bold=True)
+            rows.append(([], None))
+            rows.append((["Listings by Marketplace:"], "Section Heading"))
             
-            for marketplace, count in marketplace_counts.items():
-                row += 1
-                ws[f'A{row}'] = f"  {marketplace}:"
-                ws[f'B{row}'] = count
+            for marketplace, count in aggregates.marketplace_counts.items():
+                rows.append(([f"  {marketplace}:", count], None))
             
             # Price statistics
-            if price_data:
-                row += 2
-                ws[f'A{row}'] = "Price Statistics:"
-                ws[f'A{row}'].font = Font(bold=True)
-                
-                row += 1
-                ws[f'A{row}'] = "  Average Price:"
-                ws[f'B{row}'] = f"£{sum(price_data) / len(price_data):.2f}"
-                
-                row += 1
-                ws[f'A{row}'] = "  Min Price:"
-                ws[f'B{row}'] = f"£{min(price_data):.2f}"
-                
-                row += 1
-                ws[f'A{row}'] = "  Max Price:"
-                ws[f'B{row}'] = f"£{max(price_data):.2f}"
+            if price_data.size:
+                rows.append(([], None))
+                rows.append((["Price Statistics:"], "Section Heading"))
+                average_price, min_price, max_price = self._price_stats(price_data)
+                rows.append((["  Average Price:", f"£{average_price:.2f}"], None))
+                rows.append((["  Min Price:", f"£{min_price:.2f}"], None))
+                rows.append((["  Max Price:", f"£{max_price:.2f}"], None))
             
             # GPU model breakdown (top 10)
-            row += 2
-            ws[f'A{row}'] = "Top GPU Models:"
-            ws[f'A{row}'].font = Font(bold=True)
+            rows.append(([], None))
+            rows.append((["Top GPU Models:"], "Section Heading"))
             
-            sorted_models = sorted(gpu_models.items(), key=lambda x: x[1], reverse=True)
-            for model, count in sorted_models[:10]:
-                row += 1
-                ws[f'A{row}'] = f"  {model}:"
-                ws[f'B{row}'] = count
+            for model, count in aggregates.gpu_models.most_common(10):
+                rows.append(([f"  {model}:", count], None))
         
-        # Auto-adjust column widths
-        ws.column_dimensions['A'].width = 25
-        ws.column_dimensions['B'].width = 15
+        return SheetData("Summary", rows, {1: 25, 2: 15})
 
-    def _create_compliance_sheet(self, wb: Workbook, compliance_results: Dict[str, Dict[str, Any]]) -> None:
+    def _create_compliance_sheet(self, compliance_results: Dict[str, Dict[str, Any]]) -> SheetData:
         """Create compliance check results sheet"""
-        ws = wb.create_sheet("Compliance Report")
-        
-        # Title
-        ws['A1'] = "Website Compliance Check Results"
-        ws['A1'].font = Font(size=14, bold=True)
-        
-        row = 3
+        title = "Website Compliance Check Results"
         headers = ['Website', 'Robots.txt Allowed', 'Rate Limit Compliance', 'ToS Concerns', 'Notes']
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=row, column=col, value=header)
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
         
+        results_rows = []
         for site, results in compliance_results.items():
-            row += 1
-            ws.cell(row=row, column=1, value=site.title())
-            
             if 'error' in results:
-                ws.cell(row=row, column=4, value=f"Error: {results['error']}")
+                results_rows.append([site.title(), None, None, f"Error: {results['error']}"])
             else:
-                ws.cell(row=row, column=2, value="Yes" if results.get('robots_allowed', True) else "No")
-                ws.cell(row=row, column=3, value="Yes")  # Assuming we follow rate limits
-                ws.cell(row=row, column=4, value=", ".join(results.get('tos_concerns', [])) or "None")
-                ws.cell(row=row, column=5, value=results.get('notes', ''))
+                results_rows.append([
+                    site.title(),
+                    "Yes" if results.get('robots_allowed', True) else "No",
+                    "Yes",  # Assuming we follow rate limits
+                    ", ".join(results.get('tos_concerns', [])) or "None",
+                    results.get('notes', '')
+                ])
         
         # Auto-adjust column widths
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 40)
-            ws.column_dimensions[column_letter].width = adjusted_width
-
-    def _create_price_analysis_sheet(self, wb: Workbook, listings: List[Dict[str, Any]]) -> None:
-        """Create price analysis sheet with charts-ready data"""
-        ws = wb.create_sheet("Price Analysis")
+        column_widths = self._column_widths([[title], headers] + results_rows, 40)
         
-        if not listings:
-            ws['A1'] = "No data available for price analysis"
-            return
-        
-        # Title
-        ws['A1'] = "GPU Price Analysis"
-        ws['A1'].font = Font(size=14, bold=True)
+        rows = [([title], "Sheet Title"), ([], None), (headers, "Compliance Header")]
+        rows.extend((row, None) for row in results_rows)
+        return SheetData("Compliance Report", rows, column_widths)
+
+    def _create_price_analysis_sheet(self, total_listings: int, aggregates: Aggregates) -> SheetData:
+        """Create price analysis sheet with charts-ready data"""
+        if not total_listings:
+            return SheetData("Price Analysis", [(["No data available for price analysis"], None)], {})
         
-        # Prepare price data by GPU model
-        gpu_prices = {}
-        for listing in listings:
-            model = listing.get('gpu_model', 'Unknown')
-            price = listing.get('standardized_price')
-            
-            if isinstance(price, (int, float)) and price > 0:
-                if model not in gpu_prices:
-                    gpu_prices[model] = []
-                gpu_prices[model].append(price)
+        title = "GPU Price Analysis"
+        gpu_prices = aggregates.prices_by_model
         
         if not gpu_prices:
-            ws['A3'] = "No valid price data found"
-            return
+            return SheetData("Price Analysis", [([title], "Sheet Title"), ([], None), (["No valid price data found"], None)], {})
         
         # Create price summary table
-        row = 3
         headers = ['GPU Model', 'Count', 'Avg Price', 'Min Price', 'Max Price', 'Price Range']
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=row, column=col, value=header)
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="E2EFDA", end_color="E2EFDA", fill_type="solid")
-        
+        price_rows = []
         for model, prices in gpu_prices.items():
-            row += 1
-            ws.cell(row=row, column=1, value=model)
-            ws.cell(row=row, column=2, value=len(prices))
-            ws.cell(row=row, column=3, value=f"£{sum(prices) / len(prices):.2f}")
-            ws.cell(row=row, column=4, value=f"£{min(prices):.2f}")
-            ws.cell(row=row, column=5, value=f"£{max(prices):.2f}")
-            ws.cell(row=row, column=6, value=f"£{max(prices) - min(prices):.2f}")
+            average_price, min_price, max_price = self._price_stats(prices)
+            price_rows.append([
+                model,
+                len(prices),
+                f"£{average_price:.2f}",
+                f"£{min_price:.2f}",
+                f"£{max_price:.2f}",
+                f"£{max_price - min_price:.2f}"
+            ])
         
         # Auto-adjust column widths
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 20)
-            ws.column_dimensions[column_letter].width = adjusted_width
+        column_widths = self._column_widths([[title], headers] + price_rows, 20)
+        
+        rows = [([title], "Sheet Title"), ([], None), (headers, "Price Header")]
+        rows.extend((row, None) for row in price_rows)
+        return SheetData("Price Analysis", rows, column_widths)
+
+    def export_to_parquet(self, listings: List[Dict[str, Any]], filename_suffix: str = "") -> str:
+        """
+        Export listings to a zstd-compressed Parquet file for downstream analysis
+        Repeated strings like marketplace and model names are dictionary encoded
+        """
+        if pa is None:
+            raise ImportError("pyarrow is required for Parquet export")
+        
+        timestamp = self._export_timestamp()
+        filepath = self.output_dir / f"gpu_listings_{timestamp:%Y%m%d_%H%M%S}{filename_suffix}.parquet"
+        
+        try:
+            # Table.from_pylist takes its columns from the first listing only, so
+            # build the columns from the union of keys instead
+            fieldnames = list(dict.fromkeys(key for listing in listings for key in listing))
+            table = pa.Table.from_pydict({
+                field: self._parquet_column([listing.get(field) for listing in listings])
+                for field in fieldnames
+            })
+            pq.write_table(
+                table, filepath, compression='zstd',
+                use_dictionary=[field for field in self.dictionary_columns if field in fieldnames]
+            )
+            
+            self.logger.info(f"Exported {len(listings)} listings to Parquet: {filepath}")
+            return str(filepath)
+            
+        except Exception as e:
+            self.logger.error(f"Failed to export to Parquet: {e}")
+            raise
+
+    @staticmethod
+    def _parquet_column(values: List[Any]):
+        """
+        Arrow array for one listing field
+        Scraped fields can mix types (a price may be 450 in one listing and '£450'
+        in another), which Arrow can't put in one column; those are written as
+        strings, with missing values kept as nulls
+        """
+        try:
+            return pa.array(values)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            return pa.array([None if value is None else str(value) for value in values], type=pa.string())
 
     def export_to_csv(self, listings: List[Dict[str, Any]], filename_suffix: str = "") -> str:
         """
         Export listings to CSV format as a backup/alternative
         """
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"gpu_listings_{timestamp}{filename_suffix}.csv"
-        filepath = self.output_dir / filename
+        timestamp = self._export_timestamp()
+        filepath = self.output_dir / f"gpu_listings_{timestamp:%Y%m%d_%H%M%S}{filename_suffix}.csv"
         
         try:
-            df = pd.DataFrame(listings)
-            df.to_csv(filepath, index=False, encoding='utf-8')
+            # Stream rows straight from the dicts; columns are the union of keys in
+            # first-seen order, matching what a DataFrame built from them would have
+            fieldnames = list(dict.fromkeys(key for listing in listings for key in listing))
+            with open(filepath, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
+                writer.writeheader()
+                writer.writerows(listings)
             
             self.logger.info(f"Exported {len(listings)} listings to CSV: {filepath}")
             return str(filepath)
@@ -329,51 +566,36 @@ class ExcelExporter:
             self.logger.error(f"Failed to export to CSV: {e}")
             raise
 
-    def create_summary_report(self, listings: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def create_summary_report(self, listings: List[Dict[str, Any]],
+                              aggregates: Optional[Aggregates] = None) -> Dict[str, Any]:
         """
         Create a summary report dictionary
         """
         if not listings:
             return {"total_listings": 0, "message": "No listings found"}
         
-        marketplace_counts = {}
-        price_data = []
-        gpu_models = {}
-        conditions = {}
-        
-        for listing in listings:
-            # Count by marketplace
-            marketplace = listing.get('marketplace', 'Unknown')
-            marketplace_counts[marketplace] = marketplace_counts.get(marketplace, 0) + 1
-            
-            # Collect price data
-            price = listing.get('standardized_price') or listing.get('price')
-            if isinstance(price, (int, float)) and price > 0:
-                price_data.append(price)
-            
-            # Count GPU models
-            model = listing.get('gpu_model', 'Unknown')
-            gpu_models[model] = gpu_models.get(model, 0) + 1
-            
-            # Count conditions
-            condition = listing.get('condition', 'Unknown')
-            conditions[condition] = conditions.get(condition, 0) + 1
+        if aggregates is None:
+            aggregates = self._aggregate(listings)
+        marketplace_counts = aggregates.marketplace_counts
+        price_data = aggregates.all_prices
+        gpu_models = aggregates.gpu_models
         
         summary = {
             "total_listings": len(listings),
-            "marketplaces": marketplace_counts,
-            "gpu_models": dict(sorted(gpu_models.items(), key=lambda x: x[1], reverse=True)[:10]),
-            "conditions": conditions,
-            "scraping_date": datetime.now().isoformat()
+            "marketplaces": dict(marketplace_counts),
+            "gpu_models": dict(gpu_models.most_common(10)),
+            "conditions": dict(aggregates.conditions),
+            "scraping_date": self._export_timestamp().isoformat()
         }
         
-        if price_data:
+        if price_data.size:
+            average_price, min_price, max_price = self._price_stats(price_data)
             summary["price_stats"] = {
                 "count": len(price_data),
-                "average": round(sum(price_data) / len(price_data), 2),
-                "min": min(price_data),
-                "max": max(price_data),
-                "range": round(max(price_data) - min(price_data), 2)
+                "average": round(average_price, 2),
+                "min": min_price,
+                "max": max_price,
+                "range": round(max_price - min_price, 2)
             }
         
         return summary
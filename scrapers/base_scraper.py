@@ -2,53 +2,177 @@
 Base scraper class with common functionality
 """
 
+import re
+import time
 import asyncio
+import bisect
+import functools
+import itertools
 import logging
+import os
 from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Any, Optional
+from urllib.parse import urlparse
 import aiohttp
 from urllib.robotparser import RobotFileParser
+import soupsieve
+from bs4 import BeautifulSoup
+
+from utils.deduplicator import Deduplicator
+
+try:
+    import hyperscan
+except ImportError:  # Optional accelerator for filter_gpu_listings
+    hyperscan = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # Optional faster HTML parser; BeautifulSoup is used without it
+    LexborHTMLParser = None
+
+
+# BeautifulSoup's select() rebuilds its selector wrapper on every call; compiling
+# each selector string once with soupsieve and reusing it skips that
+_compiled_selector = functools.lru_cache(maxsize=None)(soupsieve.compile)
+
+
+def _compile_indicator_database(indicators):
+    """
+    Compile literal indicators into a caseless Hyperscan database that reports
+    every occurrence, so one scan can cover a whole page of titles
+    Returns None when the optional hyperscan package is not installed
+    """
+    if hyperscan is None:
+        return None
+    
+    database = hyperscan.Database()
+    database.compile(
+        expressions=[re.escape(indicator).encode() for indicator in indicators],
+        ids=list(range(len(indicators))),
+        elements=len(indicators),
+        flags=[hyperscan.HS_FLAG_CASELESS] * len(indicators),
+    )
+    return database
 
 
 class BaseScraper(ABC):
+    # Patterns are compiled once at class definition time and shared by all scrapers
+    
+    # First number in a price string (commas are removed beforehand)
+    price_number_pattern = re.compile(r'(\d+(?:\.\d{2})?)')
+    
+    # Substrings suggesting a listing is a GPU, fused into one alternation and
+    # applied to lowercased text. Hyperscan, when installed, scans batched pages
+    gpu_indicators = (
+        'rtx', 'gtx', 'radeon', 'rx ', 'arc', 'graphics card',
+        'gpu', 'video card', 'nvidia', 'amd', 'intel'
+    )
+    gpu_indicator_pattern = re.compile('|'.join(re.escape(indicator) for indicator in gpu_indicators))
+    gpu_indicator_database = _compile_indicator_database(gpu_indicators)
+    
+    # Parsed robots.txt files, shared by every scraper instance and refetched once
+    # they are older than robots_cache_ttl seconds
+    robots_cache_ttl = 3600
+    _robots_cache: Dict[str, RobotFileParser] = {}
+    
     def __init__(self, config):
         self.config = config
         self.logger = logging.getLogger(self.__class__.__name__)
         self.session: Optional[aiohttp.ClientSession] = None
+        self._owns_session = False
+        self.deduplicator = Deduplicator()
+        
+        # Pages are parsed in worker processes so parsing doesn't hold up the event
+        # loop; parse_workers = 0 parses on the event loop instead
+        self.parse_workers = getattr(config.limits, 'parse_workers', os.cpu_count())
+        self.parse_pool: Optional[ProcessPoolExecutor] = None
+        self._owns_parse_pool = False
+        
+        # Requests to the same host are spaced request_interval seconds apart. A
+        # request only waits for whatever is left of the interval since the previous
+        # one, and different hosts don't wait on each other
+        requests_per_second = getattr(config.limits, 'requests_per_second', None)
+        self.request_interval = 1.0 / requests_per_second if requests_per_second else config.limits.request_delay
+        self.per_host_concurrency = getattr(config.limits, 'per_host_concurrency', 1)
+        self._next_request_at: Dict[str, float] = {}
+        self._host_locks: Dict[str, asyncio.Lock] = {}
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        
+        # Hard cap on requests in flight across all hosts, so a burst of concurrent
+        # pages queues here instead of piling up as connection timeouts
+        self._in_flight = asyncio.Semaphore(getattr(config.limits, 'max_in_flight', None) or 20)
 
     async def __aenter__(self):
         """Async context manager entry"""
-        timeout = aiohttp.ClientTimeout(total=self.config.limits.timeout)
-        self.session = aiohttp.ClientSession(
-            headers=self.config.get_request_headers(),
-            timeout=timeout
-        )
+        # A session or parsing pool handed in by the caller (see open_session) is
+        # shared with other scrapers and is left for the caller to close
+        self._owns_session = self.session is None
+        if self._owns_session:
+            self.session = self.open_session(self.config)
+        self._owns_parse_pool = self.parse_pool is None and bool(self.parse_workers)
+        if self._owns_parse_pool:
+            self.parse_pool = ProcessPoolExecutor(max_workers=self.parse_workers)
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
-        if self.session:
+        if self.parse_pool is not None and self._owns_parse_pool:
+            self.parse_pool.shutdown()
+            self.parse_pool = None
+        if self.session and self._owns_session:
             await self.session.close()
+            self.session = None
+
+    @staticmethod
+    def open_session(config, connector: Optional[aiohttp.TCPConnector] = None) -> aiohttp.ClientSession:
+        """Create a client session configured for scraping"""
+        timeout = aiohttp.ClientTimeout(total=config.limits.timeout)
+        if connector is None:
+            # Keep connections to the marketplace hosts alive between requests and cache
+            # DNS so TLS handshakes and lookups are paid once per scrape, not per page
+            connector = aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=10,
+                keepalive_timeout=30,
+                ttl_dns_cache=300
+            )
+        return aiohttp.ClientSession(
+            headers=config.get_request_headers(),
+            timeout=timeout,
+            connector=connector,
+            trust_env=False
+        )
 
     async def make_request(self, url: str, **kwargs) -> Optional[str]:
         """Make an HTTP request with error handling and rate limiting"""
         if not self.session:
             raise RuntimeError("Session not initialized. Use async context manager.")
         
+        host = urlparse(url).netloc
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._host_semaphores[host] = asyncio.Semaphore(self.per_host_concurrency)
+        
         try:
-            # Rate limiting
-            await asyncio.sleep(self.config.limits.request_delay)
-            
-            async with self.session.get(url, **kwargs) as response:
-                if response.status == 200:
-                    return await response.text()
-                elif response.status == 429:
-                    self.logger.warning(f"Rate limited on {url}, waiting...")
-                    await asyncio.sleep(10)
-                    return None
-                else:
-                    self.logger.warning(f"HTTP {response.status} for {url}")
-                    return None
+            async with semaphore:
+                # Rate limiting
+                await self._wait_for_rate_limit(host)
+                
+                # aiohttp advertises gzip/deflate (and br when Brotli is installed) by
+                # default and decompresses in C; the body is then decoded once from the
+                # declared charset, falling back to UTF-8 rather than sniffing it
+                async with self._in_flight, self.session.get(url, **kwargs) as response:
+                    if response.status == 200:
+                        body = await response.read()
+                        return body.decode(response.charset or 'utf-8', errors='replace')
+                    elif response.status == 429:
+                        self.logger.warning(f"Rate limited on {url}, waiting...")
+                        await asyncio.sleep(10)
+                        return None
+                    else:
+                        self.logger.warning(f"HTTP {response.status} for {url}")
+                        return None
                     
         except asyncio.TimeoutError:
             self.logger.error(f"Timeout for {url}")
@@ -57,17 +181,57 @@ class BaseScraper(ABC):
             self.logger.error(f"Request failed for {url}: {e}")
             return None
 
-    def check_robots_txt(self, base_url: str, user_agent: str = "*") -> bool:
-        """Check if scraping is allowed by robots.txt"""
-        try:
-            robots_url = f"{base_url}/robots.txt"
-            rp = RobotFileParser()
-            rp.set_url(robots_url)
-            rp.read()
-            return rp.can_fetch(user_agent, base_url)
-        except Exception as e:
-            self.logger.warning(f"Could not check robots.txt for {base_url}: {e}")
-            return True  # Assume allowed if we can't check
+    async def _wait_for_rate_limit(self, host: str) -> None:
+        """Wait until the per-host request interval allows another request"""
+        lock = self._host_locks.get(host)
+        if lock is None:
+            lock = self._host_locks[host] = asyncio.Lock()
+        
+        async with lock:
+            now = asyncio.get_running_loop().time()
+            wait = self._next_request_at.get(host, now) - now
+            if wait > 0:
+                await asyncio.sleep(wait)
+                now += wait
+            self._next_request_at[host] = now + self.request_interval
+
+    async def check_robots_txt(self, base_url: str, user_agent: str = "*") -> bool:
+        """Check if scraping is allowed by robots.txt; parsed files are cached per site"""
+        rp = self._robots_cache.get(base_url)
+        if rp is None or time.time() - rp.mtime() > self.robots_cache_ttl:
+            try:
+                rp = await self._fetch_robots_txt(base_url)
+            except Exception as e:
+                self.logger.warning(f"Could not check robots.txt for {base_url}: {e}")
+                return True  # Assume allowed if we can't check
+            rp.modified()
+            self._robots_cache[base_url] = rp
+        
+        return rp.can_fetch(user_agent, base_url)
+
+    async def _fetch_robots_txt(self, base_url: str) -> RobotFileParser:
+        """
+        Fetch and parse robots.txt over the scraper's session
+        RobotFileParser.read() would block the event loop with urlopen, so the body is
+        fetched here and handed to parse(), mirroring read()'s handling of error codes
+        """
+        if not self.session:
+            raise RuntimeError("Session not initialized. Use async context manager.")
+        
+        robots_url = f"{base_url}/robots.txt"
+        rp = RobotFileParser(robots_url)
+        
+        await self._wait_for_rate_limit(urlparse(robots_url).netloc)
+        async with self.session.get(robots_url) as response:
+            if response.status in (401, 403):
+                rp.disallow_all = True
+            elif 400 <= response.status < 500:
+                rp.allow_all = True
+            else:
+                response.raise_for_status()
+                rp.parse((await response.text()).splitlines())
+        
+        return rp
 
     @abstractmethod
     async def scrape_gpu_listings(self) -> List[Dict[str, Any]]:
@@ -79,18 +243,110 @@ class BaseScraper(ABC):
         """Parse a single listing element into structured data"""
         pass
 
+    def _register_listing(self, listing: Dict[str, Any]) -> bool:
+        """
+        Record a newly scraped listing with the deduplicator
+        False for sold listings and for duplicates of one already scraped
+        """
+        if listing.get('is_sold'):
+            return False
+        return self.deduplicator.register_listing(listing)
+
+    async def run_parser(self, parser, *args):
+        """
+        Call parser(*args) in the parsing pool, or directly when there is no pool
+        The parser must be picklable, so use a classmethod or module-level function
+        """
+        if self.parse_pool is None:
+            return parser(*args)
+        return await asyncio.get_running_loop().run_in_executor(self.parse_pool, parser, *args)
+
+    @staticmethod
+    def parse_html(html_content: str):
+        """
+        Parse a page with selectolax's Lexbor backend when it is installed, otherwise
+        with BeautifulSoup on lxml, a required dependency. Query the result with the select
+        helpers below, which work on nodes from either parser
+        """
+        if LexborHTMLParser is not None:
+            return LexborHTMLParser(html_content)
+        return BeautifulSoup(html_content, 'lxml')
+
+    @staticmethod
+    def select(node, selector: str) -> list:
+        """All descendants of node matching a CSS selector"""
+        if LexborHTMLParser is not None:
+            return node.css(selector)
+        return _compiled_selector(selector).select(node)
+
+    @staticmethod
+    def select_one(node, selector: str):
+        """First descendant of node matching a CSS selector, or None"""
+        if LexborHTMLParser is not None:
+            return node.css_first(selector)
+        return _compiled_selector(selector).select_one(node)
+
+    @staticmethod
+    def node_text(node) -> str:
+        """Stripped text of a node, or '' for a missing node"""
+        if node is None:
+            return ''
+        if LexborHTMLParser is not None:
+            return node.text(strip=True)
+        return node.get_text(strip=True)
+
+    @staticmethod
+    def node_attr(node, name: str) -> Optional[str]:
+        """An attribute of a node, or None if the node or attribute is missing"""
+        if node is None:
+            return None
+        if LexborHTMLParser is not None:
+            return node.attributes.get(name)
+        return node.get(name)
+
+    @staticmethod
+    def node_tag(node) -> str:
+        """Tag name of a node"""
+        if LexborHTMLParser is not None:
+            return node.tag
+        return node.name
+
+    @staticmethod
+    def has_child_elements(node) -> bool:
+        """Whether node has any element children, as opposed to only text"""
+        if LexborHTMLParser is not None:
+            return next(node.iter(), None) is not None
+        return node.find(True, recursive=False) is not None
+
+    @classmethod
+    def select_first(cls, node, *selectors: str):
+        """Match for the first selector that matches anything under node, or None"""
+        for selector in selectors:
+            match = cls.select_one(node, selector)
+            if match is not None:
+                return match
+        return None
+
+    @classmethod
+    def find_by_text(cls, node, selector: str, pattern: re.Pattern):
+        """
+        First match of selector under node whose own text matches pattern, or None
+        Matches wrapping other elements are skipped, as bs4's string= filter does;
+        a wrapper's text takes in all of its children's text
+        """
+        for match in cls.select(node, selector):
+            if not cls.has_child_elements(match) and pattern.search(cls.node_text(match)):
+                return match
+        return None
+
     def extract_price(self, price_text: str) -> Optional[float]:
         """Extract numeric price from text"""
         if not price_text:
             return None
             
-        import re
-        # Remove currency symbols and common text
-        cleaned = re.sub(r'[£$€,]', '', price_text.lower())
-        cleaned = re.sub(r'(ono|or best offer|obo)', '', cleaned)
-        
-        # Extract first number
-        match = re.search(r'(\d+(?:\.\d{2})?)', cleaned)
+        # Currency symbols and "ono"/"obo" never touch the digits, so only the
+        # thousands separators need removing before taking the first number
+        match = self.price_number_pattern.search(price_text.replace(',', ''))
         if match:
             try:
                 return float(match.group(1))
@@ -100,11 +356,31 @@ class BaseScraper(ABC):
 
     def is_gpu_listing(self, title: str, description: str = "") -> bool:
         """Check if listing is likely a GPU based on title/description"""
-        text = (title + " " + description).lower()
+        return self._has_gpu_indicator((title + " " + description).lower())
+
+    def _has_gpu_indicator(self, text: str) -> bool:
+        """Whether lowercased text contains any GPU indicator"""
+        return self.gpu_indicator_pattern.search(text) is not None
+
+    def filter_gpu_listings(self, texts: List[str]) -> List[bool]:
+        """
+        Batched is_gpu_listing for a page of titles
+        Uses Hyperscan when installed, scanning the whole page in a single call
+        """
+        if self.gpu_indicator_database is None:
+            return [self._has_gpu_indicator(text.lower()) for text in texts]
+        if not texts:
+            return []
+        
+        # Titles are joined with newlines, which no indicator contains, so a match
+        # never spans two titles. Its end offset is mapped back to the title by
+        # bisecting the offsets where each title's newline ends
+        encoded = [text.encode() for text in texts]
+        title_ends = list(itertools.accumulate(len(text) + 1 for text in encoded))
+        results = [False] * len(texts)
         
-        gpu_indicators = [
-            'rtx', 'gtx', 'radeon', 'rx ', 'arc', 'graphics card', 
-            'gpu', 'video card', 'nvidia', 'amd', 'intel'
-        ]
+        def on_match(indicator_id, start, end, flags, context):
+            results[bisect.bisect_left(title_ends, end)] = True
         
-        return any(indicator in text for indicator in gpu_indicators)
\ No newline at end of file
+        self.gpu_indicator_database.scan(b'\n'.join(encoded), match_event_handler=on_match)
+        return results
@@ -5,16 +5,48 @@ Scrapes GPU listings from eBay UK marketplace
 
 import asyncio
 import logging
-from typing import List, Dict, Any, Optional
-from urllib.parse import urlencode, urljoin
-from bs4 import BeautifulSoup
+from typing import List, Dict, Any, Optional, Tuple
+from urllib.parse import urlencode, urljoin, quote_plus
 import json
 import re
+from lxml import etree, html as lxml_html
 
 from .base_scraper import BaseScraper
+from utils.deduplicator import Deduplicator
+
+
+def _class_xpath(tag: str, css_class: str) -> etree.XPath:
+    """Compile an XPath for descendant tags carrying css_class, like the CSS selector tag.class"""
+    return etree.XPath(f".//{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {css_class} ')]")
 
 
 class EBayScraper(BaseScraper):
+    # Search results are parsed with lxml; listing cards are found with one XPath
+    # compiled for all pages
+    listing_container_xpath = _class_xpath('div', 's-item')
+    
+    # (tag, class) of the element holding each listing field. A card's fields are
+    # all found in a single walk over its elements, keeping the first match for each
+    listing_field_elements = {
+        ('h3', 's-item__title'): 'title',
+        ('a', 's-item__link'): 'link',
+        ('span', 's-item__price'): 'price',
+        ('span', 'SECONDARY_INFO'): 'condition',
+        ('span', 's-item__shipping'): 'shipping',
+        ('span', 's-item__location'): 'location',
+        ('span', 's-item__seller-info-text'): 'seller',
+        ('img', 's-item__image'): 'image',
+        ('span', 's-item__title--tag'): 'sold_tag',
+    }
+    listing_field_tags = tuple(dict.fromkeys(tag for tag, _ in listing_field_elements))
+    
+    # Item ID in a listing URL, from the /itm/ path or an item= query parameter
+    item_id_pattern = re.compile(r'(?:/itm/|item=)(\d+)')
+    
+    # Banner on a search page past the last result; anything listed under it is
+    # a loose "fewer words" match
+    no_results_pattern = re.compile(r'no exact matches found', re.I)
+    
     def __init__(self, config):
         super().__init__(config)
         self.base_url = "https://www.ebay.co.uk"
@@ -23,6 +55,7 @@ class EBayScraper(BaseScraper):
         # eBay-specific configuration
         self.max_pages = min(config.limits.max_pages, 10)  # eBay limits
         self.results_per_page = 50  # eBay default
+        self.listings_found = 0  # Across all search terms of the current scrape
         
         # Search parameters for GPU listings
         self.search_params = {
@@ -36,6 +69,11 @@ class EBayScraper(BaseScraper):
             '_ipg': '50',   # Items per page
             '_pgn': '1'     # Page number
         }
+        
+        # Only the search term and page change between requests, so the rest of the
+        # query string is encoded once. Keys keep search_params' order
+        static_query = urlencode({k: v for k, v in self.search_params.items() if k not in ('_nkw', '_pgn')})
+        self.search_url_template = f"{self.search_url}?_nkw={{keywords}}&{static_query}&_pgn={{page}}"
 
     async def scrape_gpu_listings(self) -> List[Dict[str, Any]]:
         """
@@ -43,141 +81,160 @@ class EBayScraper(BaseScraper):
         """
         self.logger.info("Starting eBay UK GPU scraping...")
         
-        # Check robots.txt compliance
-        if not self.check_robots_txt(self.base_url):
-            self.logger.warning("Robots.txt may restrict scraping")
-        
         all_listings = []
         search_terms = self.config.get_search_terms()
+        self.deduplicator = Deduplicator()
+        self.listings_found = 0
         
         async with self:  # Use async context manager
-            for search_term in search_terms:
-                self.logger.info(f"Searching eBay for: {search_term}")
-                
-                listings = await self._search_gpu_term(search_term)
+            # Check robots.txt compliance
+            if not await self.check_robots_txt(self.base_url):
+                self.logger.warning("Robots.txt may restrict scraping")
+            
+            # Search terms run concurrently; make_request's per-host limits still
+            # decide how many requests reach eBay and how far apart. Results are
+            # gathered in search term order
+            self.logger.info(f"Searching eBay for: {', '.join(search_terms)}")
+            for listings in await asyncio.gather(*(self._search_gpu_term(term) for term in search_terms)):
                 all_listings.extend(listings)
-                
-                # Respect rate limits between searches
-                await asyncio.sleep(self.config.limits.request_delay)
-                
-                if len(all_listings) >= self.config.limits.max_results_per_site:
-                    break
         
-        # Remove duplicates and filter
-        unique_listings = self._deduplicate_listings(all_listings)
-        self.logger.info(f"Found {len(unique_listings)} unique eBay listings")
+        # Duplicates and sold listings were dropped as pages were parsed
+        self.logger.info(f"Found {len(all_listings)} unique eBay listings")
         
-        return unique_listings[:self.config.limits.max_results_per_site]
+        return all_listings[:self.config.limits.max_results_per_site]
 
     async def _search_gpu_term(self, search_term: str) -> List[Dict[str, Any]]:
         """
         Search for a specific GPU term across multiple pages
         """
         listings = []
+        keywords = quote_plus(search_term)
         
         for page in range(1, self.max_pages + 1):
+            # Stop paging once all terms together have found enough listings
+            if self.listings_found >= self.config.limits.max_results_per_site:
+                break
+            
             self.logger.debug(f"Scraping eBay page {page} for '{search_term}'")
             
             # Build search URL
-            params = self.search_params.copy()
-            params['_nkw'] = search_term
-            params['_pgn'] = page
-            
-            search_url = f"{self.search_url}?{urlencode(params)}"
+            search_url = self.search_url_template.format(keywords=keywords, page=page)
             
             # Fetch page content
             html_content = await self.make_request(search_url)
             if not html_content:
                 continue
             
+            # A page past the end of the results isn't worth parsing
+            if self.no_results_pattern.search(html_content):
+                break
+            
             # Parse listings from page
-            page_listings = await self._parse_search_results(html_content, search_term)
+            page_listings, card_count = await self._parse_search_results(html_content, search_term)
             listings.extend(page_listings)
+            self.listings_found += len(page_listings)
             
             # Check if we've reached the end
-            if len(page_listings) < self.results_per_page:
+            if card_count < self.results_per_page:
                 break
-                
-            # Rate limiting between pages
-            await asyncio.sleep(self.config.limits.request_delay)
         
         return listings
 
-    async def _parse_search_results(self, html_content: str, search_term: str) -> List[Dict[str, Any]]:
+    async def _parse_search_results(self, html_content: str, search_term: str) -> Tuple[List[Dict[str, Any]], int]:
         """
         Parse eBay search results page
+        Returns the new GPU listings and the number of cards on the page, which is
+        what tells a full page from the last one; duplicates and sold listings are
+        dropped from the listings but still count as cards
         """
         listings = []
-        soup = BeautifulSoup(html_content, 'html.parser')
+        parsed_listings = await self.run_parser(self._parse_page, html_content)
+        
+        # Classify the whole page at once
+        is_gpu = self.filter_gpu_listings([listing_data['title'] for listing_data in parsed_listings])
+        for listing_data, gpu_listing in zip(parsed_listings, is_gpu):
+            if gpu_listing and self._register_listing(listing_data):
+                listing_data['search_term'] = search_term
+                listings.append(listing_data)
+        
+        self.logger.debug(f"Parsed {len(listings)} listings from eBay page")
+        return listings, len(parsed_listings)
+
+    @classmethod
+    def _parse_page(cls, html_content: str) -> List[Dict[str, Any]]:
+        """
+        Parse every listing on a search results page
+        A classmethod so it can run in a worker process without pickling the scraper
+        """
+        logger = logging.getLogger(cls.__name__)
+        try:
+            tree = lxml_html.fromstring(html_content)
+        except etree.ParserError as e:  # Whitespace-only or otherwise empty page
+            logger.debug(f"Empty eBay results page: {e}")
+            return []
         
         # Find listing containers
-        listing_containers = soup.find_all('div', {'class': 's-item'})
+        listing_containers = cls.listing_container_xpath(tree)
         
+        parsed_listings = []
         for container in listing_containers:
             try:
-                listing_data = self.parse_listing(container)
-                if listing_data and self.is_gpu_listing(listing_data['title']):
-                    listing_data['search_term'] = search_term
-                    listings.append(listing_data)
+                listing_data = cls.parse_listing(container)
+                if listing_data:
+                    parsed_listings.append(listing_data)
             except Exception as e:
-                self.logger.debug(f"Failed to parse eBay listing: {e}")
+                logger.debug(f"Failed to parse eBay listing: {e}")
                 continue
         
-        self.logger.debug(f"Parsed {len(listings)} listings from eBay page")
-        return listings
+        return parsed_listings
 
-    def parse_listing(self, listing_element) -> Optional[Dict[str, Any]]:
+    @classmethod
+    def parse_listing(cls, listing_element) -> Optional[Dict[str, Any]]:
         """
-        Parse a single eBay listing element
+        Parse a single eBay listing element (an lxml element)
         """
         try:
             # Extract basic information
-            title_elem = listing_element.find('h3', class_='s-item__title')
-            if not title_elem:
+            fields = cls._find_field_elements(listing_element)
+            title_elem = fields.get('title')
+            if title_elem is None:
                 return None
             
-            title = title_elem.get_text(strip=True)
-            if title.lower().startswith('shop on ebay'):
+            title = cls._element_text(title_elem)
+            if title[:12].lower() == 'shop on ebay':
                 return None  # Skip promotional items
             
             # Extract URL
-            link_elem = listing_element.find('a', class_='s-item__link')
-            url = link_elem.get('href') if link_elem else None
+            url = cls._field_attr(fields, 'link', 'href')
             
             # Extract price
-            price_elem = listing_element.find('span', class_='s-item__price')
-            price_text = price_elem.get_text(strip=True) if price_elem else ''
+            price_text = cls._field_text(fields, 'price')
             
             # Extract condition
-            condition_elem = listing_element.find('span', class_='SECONDARY_INFO')
-            condition = condition_elem.get_text(strip=True) if condition_elem else ''
+            condition = cls._field_text(fields, 'condition')
             
             # Extract shipping info
-            shipping_elem = listing_element.find('span', class_='s-item__shipping')
-            shipping = shipping_elem.get_text(strip=True) if shipping_elem else ''
+            shipping = cls._field_text(fields, 'shipping')
             
             # Extract location
-            location_elem = listing_element.find('span', class_='s-item__location')
-            location = location_elem.get_text(strip=True) if location_elem else ''
+            location = cls._field_text(fields, 'location')
             
             # Extract seller info
-            seller_elem = listing_element.find('span', class_='s-item__seller-info-text')
-            seller_info = seller_elem.get_text(strip=True) if seller_elem else ''
+            seller_info = cls._field_text(fields, 'seller')
             
             # Extract listing type (auction vs buy it now)
             listing_type = 'Buy It Now'  # We filtered for BIN only
             
             # Extract image URL
-            img_elem = listing_element.find('img', class_='s-item__image')
-            image_url = img_elem.get('src') if img_elem else None
+            image_url = cls._field_attr(fields, 'image', 'src')
             
             # Check for "SOLD" or "SOLD LISTINGS"
-            sold_elem = listing_element.find('span', class_='s-item__title--tag')
-            is_sold = sold_elem and 'sold' in sold_elem.get_text().lower()
+            is_sold = 'sold' in cls._field_text(fields, 'sold_tag').lower()
             
             return {
                 'title': title,
                 'url': url,
+                'item_id': cls.extract_item_id(url),
                 'price': price_text,
                 'condition': condition,
                 'shipping': shipping,
@@ -190,36 +247,40 @@ class EBayScraper(BaseScraper):
             }
             
         except Exception as e:
-            self.logger.debug(f"Error parsing eBay listing element: {e}")
+            logging.getLogger(cls.__name__).debug(f"Error parsing eBay listing element: {e}")
             return None
 
-    def _deduplicate_listings(self, listings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """
-        Remove duplicate listings based on URL and title similarity
-        """
-        seen_urls = set()
-        unique_listings = []
-        
-        for listing in listings:
-            url = listing.get('url', '')
-            title = listing.get('title', '')
-            
-            # Skip sold listings
-            if listing.get('is_sold', False):
+    @staticmethod
+    def _element_text(element) -> str:
+        """Text of an lxml element, each piece stripped, as BeautifulSoup's get_text(strip=True)"""
+        return ''.join(text.strip() for text in element.itertext())
+
+    @classmethod
+    def _find_field_elements(cls, listing_element) -> Dict[str, Any]:
+        """First descendant element for each listing field, in one pass over the card"""
+        field_elements = cls.listing_field_elements
+        found = {}
+        for element in listing_element.iter(*cls.listing_field_tags):
+            classes = element.get('class')
+            if not classes:
                 continue
-            
-            # Use URL as primary deduplication key
-            if url and url not in seen_urls:
-                seen_urls.add(url)
-                unique_listings.append(listing)
-            elif not url:
-                # For listings without URL, use title-based deduplication
-                title_hash = hash(title.lower()[:50])  # First 50 chars
-                if title_hash not in seen_urls:
-                    seen_urls.add(title_hash)
-                    unique_listings.append(listing)
-        
-        return unique_listings
+            for css_class in classes.split():
+                field = field_elements.get((element.tag, css_class))
+                if field is not None and field not in found:
+                    found[field] = element
+        return found
+
+    @classmethod
+    def _field_text(cls, fields: Dict[str, Any], field: str) -> str:
+        """Text of a listing field's element, or ''"""
+        element = fields.get(field)
+        return cls._element_text(element) if element is not None else ''
+
+    @staticmethod
+    def _field_attr(fields: Dict[str, Any], field: str, name: str) -> Optional[str]:
+        """An attribute of a listing field's element, or None"""
+        element = fields.get(field)
+        return element.get(name) if element is not None else None
 
     async def get_listing_details(self, listing_url: str) -> Optional[Dict[str, Any]]:
         """
@@ -230,43 +291,54 @@ class EBayScraper(BaseScraper):
             if not html_content:
                 return None
             
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # Extract detailed description
-            desc_elem = soup.find('div', {'id': 'desc_div'}) or soup.find('div', class_='u-flL condText')
-            description = desc_elem.get_text(strip=True) if desc_elem else ''
-            
-            # Extract item specifics
-            specifics = {}
-            specifics_section = soup.find('div', {'id': 'viTabs_0_is'})
-            if specifics_section:
-                labels = specifics_section.find_all('dt', class_='attrLabels')
-                values = specifics_section.find_all('dd', class_='attrValues')
-                
-                for label, value in zip(labels, values):
-                    key = label.get_text(strip=True).rstrip(':')
-                    val = value.get_text(strip=True)
-                    specifics[key] = val
-            
-            # Extract multiple images
-            image_urls = []
-            img_elements = soup.find_all('img', {'id': re.compile(r'icImg')})
-            for img in img_elements:
-                src = img.get('src')
-                if src and src.startswith('http'):
-                    image_urls.append(src)
-            
-            return {
-                'description': description,
-                'item_specifics': specifics,
-                'image_urls': image_urls
-            }
+            return await self.run_parser(self._parse_details, html_content)
             
         except Exception as e:
             self.logger.error(f"Failed to get eBay listing details: {e}")
             return None
 
-    def extract_item_id(self, url: str) -> Optional[str]:
+    @classmethod
+    def _parse_details(cls, html_content: str) -> Dict[str, Any]:
+        """
+        Parse an individual eBay listing page
+        A classmethod so it can run in a worker process without pickling the scraper
+        """
+        tree = cls.parse_html(html_content)
+        
+        # Extract detailed description
+        desc_elem = cls.select_one(tree, 'div#desc_div')
+        if desc_elem is None:
+            desc_elem = cls.select_one(tree, 'div.u-flL.condText')
+        description = cls.node_text(desc_elem)
+        
+        # Extract item specifics
+        specifics = {}
+        specifics_section = cls.select_one(tree, 'div#viTabs_0_is')
+        if specifics_section is not None:
+            labels = cls.select(specifics_section, 'dt.attrLabels')
+            values = cls.select(specifics_section, 'dd.attrValues')
+            
+            for label, value in zip(labels, values):
+                key = cls.node_text(label).rstrip(':')
+                val = cls.node_text(value)
+                specifics[key] = val
+        
+        # Extract multiple images
+        image_urls = []
+        img_elements = cls.select(tree, 'img[id*="icImg"]')
+        for img in img_elements:
+            src = cls.node_attr(img, 'src')
+            if src and src.startswith('http'):
+                image_urls.append(src)
+        
+        return {
+            'description': description,
+            'item_specifics': specifics,
+            'image_urls': image_urls
+        }
+
+    @classmethod
+    def extract_item_id(cls, url: str) -> Optional[str]:
         """
         Extract eBay item ID from listing URL
         """
@@ -274,16 +346,8 @@ class EBayScraper(BaseScraper):
             return None
         
         # eBay item URLs contain the item ID
-        match = re.search(r'/itm/(\d+)', url)
-        if match:
-            return match.group(1)
-        
-        # Alternative pattern
-        match = re.search(r'item=(\d+)', url)
-        if match:
-            return match.group(1)
-        
-        return None
+        match = cls.item_id_pattern.search(url)
+        return match.group(1) if match else None
 
 
 # Test function for eBay scraper
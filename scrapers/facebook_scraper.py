@@ -5,17 +5,29 @@ NOTE: Facebook requires authentication and has strict anti-bot measures
 """
 
 import asyncio
+import html
 import logging
 from typing import List, Dict, Any, Optional
 from urllib.parse import urlencode, quote
-from bs4 import BeautifulSoup
 import json
 import re
 
 from .base_scraper import BaseScraper
+from utils.deduplicator import Deduplicator
 
 
 class FacebookScraper(BaseScraper):
+    # Listing fields are picked out by the text of their <span>, not by class names
+    title_text_pattern = re.compile(r'RTX|GTX|RX|Arc', re.I)
+    price_text_pattern = re.compile(r'£\d+')
+    location_text_pattern = re.compile(r'miles away|km away')
+    description_text_pattern = re.compile(r'.{20,}')
+    
+    # Pages without data-testid containers list items as bare links. Those are cut
+    # straight out of the HTML, along with the text of the <span>s inside them
+    item_link_pattern = re.compile(r'<a\b[^>]*?\bhref="([^"]*/marketplace/item/[^"]*)"[^>]*>(.*?)</a>', re.S | re.I)
+    span_text_pattern = re.compile(r'<span\b[^>]*>([^<]*)</span>', re.I)
+    
     def __init__(self, config):
         super().__init__(config)
         self.base_url = "https://www.facebook.com"
@@ -24,6 +36,7 @@ class FacebookScraper(BaseScraper):
         # Facebook-specific settings
         self.location = "london-uk"  # UK location
         self.max_pages = min(config.limits.max_pages, 5)  # FB has aggressive rate limiting
+        self.request_interval *= 3  # and needs requests spaced further apart
         
         # Authentication status
         self.is_authenticated = False
@@ -39,14 +52,15 @@ class FacebookScraper(BaseScraper):
             self.logger.warning("No Facebook authentication credentials provided")
             return []
         
-        # Check robots.txt compliance
-        if not self.check_robots_txt(self.base_url):
-            self.logger.warning("Robots.txt restricts Facebook scraping")
-        
         all_listings = []
         search_terms = self.config.get_search_terms()
+        self.deduplicator = Deduplicator()
         
         async with self:  # Use async context manager
+            # Check robots.txt compliance
+            if not await self.check_robots_txt(self.base_url):
+                self.logger.warning("Robots.txt restricts Facebook scraping")
+            
             # Attempt authentication
             if await self._authenticate():
                 for search_term in search_terms:
@@ -55,20 +69,16 @@ class FacebookScraper(BaseScraper):
                     listings = await self._search_gpu_term(search_term)
                     all_listings.extend(listings)
                     
-                    # Aggressive rate limiting for Facebook
-                    await asyncio.sleep(self.config.limits.request_delay * 2)
-                    
                     if len(all_listings) >= self.config.limits.max_results_per_site:
                         break
             else:
                 self.logger.error("Failed to authenticate with Facebook")
                 return []
         
-        # Remove duplicates and filter
-        unique_listings = self._deduplicate_listings(all_listings)
-        self.logger.info(f"Found {len(unique_listings)} unique Facebook listings")
+        # Duplicates and sold listings were dropped as pages were parsed
+        self.logger.info(f"Found {len(all_listings)} unique Facebook listings")
         
-        return unique_listings[:self.config.limits.max_results_per_site]
+        return all_listings[:self.config.limits.max_results_per_site]
 
     def _has_auth_credentials(self) -> bool:
         """Check if Facebook authentication credentials are available"""
@@ -95,10 +105,9 @@ class FacebookScraper(BaseScraper):
                 return False
             
             # Parse login form (simplified)
-            soup = BeautifulSoup(login_page, 'html.parser')
-            form = soup.find('form', {'id': 'login_form'})
+            form = self.select_one(self.parse_html(login_page), 'form#login_form')
             
-            if not form:
+            if form is None:
                 self.logger.error("Could not find Facebook login form")
                 return False
             
@@ -150,9 +159,6 @@ class FacebookScraper(BaseScraper):
             page_listings = await self._parse_marketplace_results(html_content, search_term)
             listings.extend(page_listings)
             
-            # Facebook has aggressive rate limiting
-            await asyncio.sleep(self.config.limits.request_delay * 3)
-            
             if len(page_listings) == 0:
                 break
         
@@ -164,7 +170,6 @@ class FacebookScraper(BaseScraper):
         NOTE: Facebook's structure changes frequently and uses dynamic loading
         """
         listings = []
-        soup = BeautifulSoup(html_content, 'html.parser')
         
         # Facebook Marketplace uses complex, frequently-changing class names
         # and heavy JavaScript for dynamic content loading
@@ -172,21 +177,27 @@ class FacebookScraper(BaseScraper):
         
         # Look for marketplace listing containers
         # These selectors are examples and will likely not work
-        listing_containers = soup.find_all('div', {'data-testid': 'marketplace-item'})
-        
-        if not listing_containers:
+        if 'data-testid="marketplace-item"' in html_content:
+            tree = self.parse_html(html_content)
+            parsed_listings = []
+            for container in self.select(tree, 'div[data-testid="marketplace-item"]'):
+                try:
+                    listing_data = self.parse_listing(container)
+                    if listing_data:
+                        parsed_listings.append(listing_data)
+                except Exception as e:
+                    self.logger.debug(f"Failed to parse Facebook listing: {e}")
+                    continue
+        else:
             # Try alternative selectors
-            listing_containers = soup.find_all('a', href=re.compile(r'/marketplace/item/'))
+            parsed_listings = self._parse_item_links(html_content)
         
-        for container in listing_containers:
-            try:
-                listing_data = self.parse_listing(container)
-                if listing_data and self.is_gpu_listing(listing_data['title']):
-                    listing_data['search_term'] = search_term
-                    listings.append(listing_data)
-            except Exception as e:
-                self.logger.debug(f"Failed to parse Facebook listing: {e}")
-                continue
+        # Classify the whole page at once
+        is_gpu = self.filter_gpu_listings([listing_data['title'] for listing_data in parsed_listings])
+        for listing_data, gpu_listing in zip(parsed_listings, is_gpu):
+            if gpu_listing and self._register_listing(listing_data):
+                listing_data['search_term'] = search_term
+                listings.append(listing_data)
         
         self.logger.debug(f"Parsed {len(listings)} listings from Facebook page")
         return listings
@@ -201,67 +212,69 @@ class FacebookScraper(BaseScraper):
             # Facebook's actual structure is much more complex
             
             # Extract title
-            title_elem = listing_element.find('span', string=re.compile(r'RTX|GTX|RX|Arc', re.I))
-            title = title_elem.get_text(strip=True) if title_elem else ''
+            title = self.node_text(self.find_by_text(listing_element, 'span', self.title_text_pattern))
             
             # Extract URL
-            link_elem = listing_element if listing_element.name == 'a' else listing_element.find('a')
-            url = link_elem.get('href') if link_elem else None
+            link_elem = listing_element if self.node_tag(listing_element) == 'a' else self.select_one(listing_element, 'a')
+            url = self.node_attr(link_elem, 'href')
             if url and url.startswith('/'):
                 url = self.base_url + url
             
             # Extract price
-            price_elem = listing_element.find('span', string=re.compile(r'£\d+'))
-            price_text = price_elem.get_text(strip=True) if price_elem else ''
+            price_text = self.node_text(self.find_by_text(listing_element, 'span', self.price_text_pattern))
             
             # Extract location
-            location_elem = listing_element.find('span', string=re.compile(r'miles away|km away'))
-            location = location_elem.get_text(strip=True) if location_elem else ''
+            location = self.node_text(self.find_by_text(listing_element, 'span', self.location_text_pattern))
             
-            # Facebook Marketplace specific fields
-            listing_type = 'Marketplace'
-            condition = 'Unknown'  # Facebook doesn't always specify
-            
-            if not title or not url:
-                return None
-            
-            return {
-                'title': title,
-                'url': url,
-                'price': price_text,
-                'condition': condition,
-                'location': location,
-                'listing_type': listing_type,
-                'marketplace': 'Facebook Marketplace UK'
-            }
+            return self._build_listing(title, url, price_text, location)
             
         except Exception as e:
             self.logger.debug(f"Error parsing Facebook listing element: {e}")
             return None
 
-    def _deduplicate_listings(self, listings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _parse_item_links(self, html_content: str) -> List[Dict[str, Any]]:
         """
-        Remove duplicate listings based on URL and title similarity
+        Parse listings from the item links in a page's raw HTML without building a DOM
+        Field text comes from <span>s that hold only text, matched by the same patterns
         """
-        seen_urls = set()
-        unique_listings = []
-        
-        for listing in listings:
-            url = listing.get('url', '')
-            title = listing.get('title', '')
+        parsed_listings = []
+        for match in self.item_link_pattern.finditer(html_content):
+            url, inner_html = match.groups()
+            url = html.unescape(url)
+            if url.startswith('/'):
+                url = self.base_url + url
+            span_texts = [html.unescape(text).strip() for text in self.span_text_pattern.findall(inner_html)]
             
-            # Use URL as primary deduplication key
-            if url and url not in seen_urls:
-                seen_urls.add(url)
-                unique_listings.append(listing)
-            elif not url:
-                # For listings without URL, use title-based deduplication
-                title_hash = hash(title.lower()[:50])
-                if title_hash not in seen_urls:
-                    seen_urls.add(title_hash)
-                    unique_listings.append(listing)
+            listing_data = self._build_listing(
+                title=self._first_matching(span_texts, self.title_text_pattern),
+                url=url,
+                price_text=self._first_matching(span_texts, self.price_text_pattern),
+                location=self._first_matching(span_texts, self.location_text_pattern)
+            )
+            if listing_data:
+                parsed_listings.append(listing_data)
         
-        return unique_listings
+        return parsed_listings
+
+    @staticmethod
+    def _first_matching(texts: List[str], pattern: re.Pattern) -> str:
+        """First text that pattern matches, or ''"""
+        return next((text for text in texts if pattern.search(text)), '')
+
+    def _build_listing(self, title: str, url: Optional[str], price_text: str, location: str) -> Optional[Dict[str, Any]]:
+        """Listing dict from the extracted fields, or None without a title and URL"""
+        if not title or not url:
+            return None
+        
+        return {
+            'title': title,
+            'url': url,
+            'price': price_text,
+            'condition': 'Unknown',  # Facebook doesn't always specify
+            'location': location,
+            'listing_type': 'Marketplace',
+            'marketplace': 'Facebook Marketplace UK'
+        }
 
     async def get_listing_details(self, listing_url: str) -> Optional[Dict[str, Any]]:
         """
@@ -277,22 +290,19 @@ class FacebookScraper(BaseScraper):
             if not html_content:
                 return None
             
-            soup = BeautifulSoup(html_content, 'html.parser')
+            tree = self.parse_html(html_content)
             
             # Extract description (Facebook structure is complex)
-            description = ''
-            desc_elements = soup.find_all('span', string=re.compile(r'.{20,}'))
-            if desc_elements:
-                description = desc_elements[0].get_text(strip=True)
+            description = self.node_text(self.find_by_text(tree, 'span', self.description_text_pattern))
             
             # Extract seller information
             seller_info = {}
             
             # Extract images
             image_urls = []
-            img_elements = soup.find_all('img', src=re.compile(r'scontent'))
+            img_elements = self.select(tree, 'img[src*="scontent"]')
             for img in img_elements[:5]:  # Limit to first 5 images
-                src = img.get('src')
+                src = self.node_attr(img, 'src')
                 if src:
                     image_urls.append(src)
             
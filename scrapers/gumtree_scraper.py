@@ -5,19 +5,47 @@ Scrapes GPU listings from Gumtree UK marketplace
 
 import asyncio
 import logging
-from typing import List, Dict, Any, Optional
-from urllib.parse import urlencode, urljoin
-from bs4 import BeautifulSoup
+from typing import List, Dict, Any, Optional, Tuple
+from urllib.parse import urlencode, urljoin, quote_plus
 import json
 import re
 
 from .base_scraper import BaseScraper
+from utils.deduplicator import Deduplicator
 
 
 class GumtreeScraper(BaseScraper):
+    # Gumtree's class names carry build suffixes, so elements are matched on class
+    # substrings. Each field lists its selectors in order of preference
+    listing_container_selectors = (
+        'div[class*="listing-maxi"]', 'article[class*="listing-maxi"]', 'div[class*="natural"]'
+    )
+    title_selectors = ('a[class*="listing-link"]', 'h2[class*="listing-title"]', 'a[href*="/ad/"]')
+    price_selectors = ('span[class*="listing-price"]', 'strong[class*="amount"]')
+    location_selectors = ('span[class*="listing-location"]', 'div[class*="location"]')
+    posted_date_selectors = ('span[class*="listing-posted-date"]', 'time')
+    description_selectors = ('p[class*="listing-description"]', 'div[class*="description"]')
+    image_selectors = ('img[class*="listing-thumbnail"]', 'img[src*="i.ebayimg"], img[src*="gumtree"]')
+    seller_selectors = ('span[class*="seller"]', 'div[class*="seller"]')
+    
+    # Class substrings the container selectors look for; a page containing none of
+    # them has no cards to parse
+    listing_container_markers = ('listing-maxi', 'natural')
+    
+    # Price text for cards whose price has no recognisable class
+    price_text_pattern = re.compile(r'£\d+')
+    
+    # Ad ID in a listing URL, tried in order: the /ad/ path, then an adId= query.
+    # Each pattern is only run on URLs containing its literal prefix
+    ad_id_patterns = (
+        ('/ad/', re.compile(r'/ad/(\d+)')),
+        ('adId=', re.compile(r'adId=(\d+)')),
+    )
+    
+    base_url = "https://www.gumtree.com"
+    
     def __init__(self, config):
         super().__init__(config)
-        self.base_url = "https://www.gumtree.com"
         self.search_url = "https://www.gumtree.com/search"
         
         # Gumtree-specific configuration
@@ -33,6 +61,12 @@ class GumtreeScraper(BaseScraper):
             'search_scope': 'title_and_description',
             'page': '1'
         }
+        
+        # Only the search term and page change between requests, so the rest of the
+        # query string is encoded once. q comes first and page last, with the other
+        # keys between them in search_params' order
+        static_query = urlencode({k: v for k, v in self.search_params.items() if k not in ('q', 'page')})
+        self.search_url_template = f"{self.search_url}?q={{keywords}}&{static_query}&page={{page}}"
 
     async def scrape_gpu_listings(self) -> List[Dict[str, Any]]:
         """
@@ -40,156 +74,175 @@ class GumtreeScraper(BaseScraper):
         """
         self.logger.info("Starting Gumtree UK GPU scraping...")
         
-        # Check robots.txt compliance
-        if not self.check_robots_txt(self.base_url):
-            self.logger.warning("Robots.txt may restrict scraping")
-        
         all_listings = []
         search_terms = self.config.get_search_terms()
+        self.deduplicator = Deduplicator()
         
         async with self:  # Use async context manager
+            # Check robots.txt compliance
+            if not await self.check_robots_txt(self.base_url):
+                self.logger.warning("Robots.txt may restrict scraping")
+            
             for search_term in search_terms:
                 self.logger.info(f"Searching Gumtree for: {search_term}")
                 
                 listings = await self._search_gpu_term(search_term)
                 all_listings.extend(listings)
                 
-                # Respect rate limits between searches
-                await asyncio.sleep(self.config.limits.request_delay)
-                
                 if len(all_listings) >= self.config.limits.max_results_per_site:
                     break
         
-        # Remove duplicates and filter
-        unique_listings = self._deduplicate_listings(all_listings)
-        self.logger.info(f"Found {len(unique_listings)} unique Gumtree listings")
+        # Duplicates and sold listings were dropped as pages were parsed
+        self.logger.info(f"Found {len(all_listings)} unique Gumtree listings")
         
-        return unique_listings[:self.config.limits.max_results_per_site]
+        return all_listings[:self.config.limits.max_results_per_site]
 
     async def _search_gpu_term(self, search_term: str) -> List[Dict[str, Any]]:
         """
         Search for a specific GPU term across multiple pages
         """
         listings = []
+        keywords = quote_plus(search_term)
         
+        # Pages are fetched one at a time on purpose. make_request already lets one
+        # request per host through at a time (per_host_concurrency defaults to 1),
+        # spaced request_interval apart, so gathering pages would overlap no waits;
+        # it would only request pages past the first short one, i.e. past the end
+        # of the results
         for page in range(1, self.max_pages + 1):
-            self.logger.debug(f"Scraping Gumtree page {page} for '{search_term}'")
-            
-            # Build search URL
-            params = self.search_params.copy()
-            params['q'] = search_term
-            params['page'] = page
-            
-            search_url = f"{self.search_url}?{urlencode(params)}"
-            
-            # Fetch page content
-            html_content = await self.make_request(search_url)
-            if not html_content:
+            page_results = await self._search_page(search_term, keywords, page)
+            if page_results is None:
                 continue
-            
-            # Parse listings from page
-            page_listings = await self._parse_search_results(html_content, search_term)
+            page_listings, card_count = page_results
             listings.extend(page_listings)
             
             # Check if we've reached the end
-            if len(page_listings) < self.results_per_page:
+            if card_count < self.results_per_page:
                 break
-                
-            # Rate limiting between pages
-            await asyncio.sleep(self.config.limits.request_delay)
         
         return listings
 
-    async def _parse_search_results(self, html_content: str, search_term: str) -> List[Dict[str, Any]]:
+    async def _search_page(self, search_term: str, keywords: str,
+                           page: int) -> Optional[Tuple[List[Dict[str, Any]], int]]:
+        """
+        Fetch and parse one page of search results, or None if the fetch failed
+        Returns _parse_search_results' listings and card count
+        keywords is the search term already encoded for the query string
+        """
+        self.logger.debug(f"Scraping Gumtree page {page} for '{search_term}'")
+        
+        # Build search URL
+        search_url = self.search_url_template.format(keywords=keywords, page=page)
+        
+        # Fetch page content
+        html_content = await self.make_request(search_url)
+        if not html_content:
+            return None
+        
+        # Parse listings from page
+        return await self._parse_search_results(html_content, search_term)
+
+    async def _parse_search_results(self, html_content: str, search_term: str) -> Tuple[List[Dict[str, Any]], int]:
         """
         Parse Gumtree search results page
+        Returns the new GPU listings and the number of cards on the page, which is
+        what tells a full page from the last one; duplicates and sold listings are
+        dropped from the listings but still count as cards
         """
         listings = []
-        soup = BeautifulSoup(html_content, 'html.parser')
+        if not any(marker in html_content for marker in self.listing_container_markers):
+            self.logger.debug("No listing cards on Gumtree page")
+            return listings, 0
+        
+        parsed_listings = await self.run_parser(self._parse_page, html_content)
+        
+        # Classify the whole page at once
+        is_gpu = self.filter_gpu_listings([listing_data['title'] for listing_data in parsed_listings])
+        for listing_data, gpu_listing in zip(parsed_listings, is_gpu):
+            if gpu_listing and self._register_listing(listing_data):
+                listing_data['search_term'] = search_term
+                listings.append(listing_data)
+        
+        self.logger.debug(f"Parsed {len(listings)} listings from Gumtree page")
+        return listings, len(parsed_listings)
+
+    @classmethod
+    def _parse_page(cls, html_content: str) -> List[Dict[str, Any]]:
+        """
+        Parse every listing on a search results page
+        A classmethod so it can run in a worker process without pickling the scraper
+        """
+        tree = cls.parse_html(html_content)
         
         # Find listing containers - Gumtree uses various selectors
-        listing_containers = soup.find_all('div', class_=re.compile(r'listing-maxi')) or \
-                           soup.find_all('article', class_=re.compile(r'listing-maxi')) or \
-                           soup.find_all('div', class_=re.compile(r'natural'))
+        listing_containers = []
+        for selector in cls.listing_container_selectors:
+            listing_containers = cls.select(tree, selector)
+            if listing_containers:
+                break
         
+        parsed_listings = []
         for container in listing_containers:
             try:
-                listing_data = self.parse_listing(container)
-                if listing_data and self.is_gpu_listing(listing_data['title']):
-                    listing_data['search_term'] = search_term
-                    listings.append(listing_data)
+                listing_data = cls.parse_listing(container)
+                if listing_data:
+                    parsed_listings.append(listing_data)
             except Exception as e:
-                self.logger.debug(f"Failed to parse Gumtree listing: {e}")
+                logging.getLogger(cls.__name__).debug(f"Failed to parse Gumtree listing: {e}")
                 continue
         
-        self.logger.debug(f"Parsed {len(listings)} listings from Gumtree page")
-        return listings
+        return parsed_listings
 
-    def parse_listing(self, listing_element) -> Optional[Dict[str, Any]]:
+    @classmethod
+    def parse_listing(cls, listing_element) -> Optional[Dict[str, Any]]:
         """
         Parse a single Gumtree listing element
         """
         try:
             # Extract title
-            title_elem = listing_element.find('a', class_=re.compile(r'listing-link')) or \
-                        listing_element.find('h2', class_=re.compile(r'listing-title')) or \
-                        listing_element.find('a', href=re.compile(r'/ad/'))
+            title_elem = cls.select_first(listing_element, *cls.title_selectors)
             
-            if not title_elem:
+            if title_elem is None:
                 return None
             
-            title = title_elem.get_text(strip=True)
+            title = cls.node_text(title_elem)
             if not title:
                 return None
             
             # Extract URL
-            url = title_elem.get('href') if title_elem else None
+            url = cls.node_attr(title_elem, 'href')
             if url and url.startswith('/'):
-                url = urljoin(self.base_url, url)
+                url = urljoin(cls.base_url, url)
             
             # Extract price
-            price_elem = listing_element.find('span', class_=re.compile(r'listing-price')) or \
-                        listing_element.find('strong', class_=re.compile(r'amount')) or \
-                        listing_element.find('span', string=re.compile(r'£\d+'))
+            price_elem = cls.select_first(listing_element, *cls.price_selectors)
+            if price_elem is None:
+                price_elem = cls.find_by_text(listing_element, 'span', cls.price_text_pattern)
             
-            price_text = price_elem.get_text(strip=True) if price_elem else ''
+            price_text = cls.node_text(price_elem)
             
             # Extract location
-            location_elem = listing_element.find('span', class_=re.compile(r'listing-location')) or \
-                           listing_element.find('div', class_=re.compile(r'location'))
-            
-            location = location_elem.get_text(strip=True) if location_elem else ''
+            location = cls.node_text(cls.select_first(listing_element, *cls.location_selectors))
             
             # Extract date/time posted
-            date_elem = listing_element.find('span', class_=re.compile(r'listing-posted-date')) or \
-                       listing_element.find('time')
-            
-            posted_date = date_elem.get_text(strip=True) if date_elem else ''
+            posted_date = cls.node_text(cls.select_first(listing_element, *cls.posted_date_selectors))
             
             # Extract description preview
-            desc_elem = listing_element.find('p', class_=re.compile(r'listing-description')) or \
-                       listing_element.find('div', class_=re.compile(r'description'))
-            
-            description = desc_elem.get_text(strip=True) if desc_elem else ''
+            description = cls.node_text(cls.select_first(listing_element, *cls.description_selectors))
             
             # Extract image URL
-            img_elem = listing_element.find('img', class_=re.compile(r'listing-thumbnail')) or \
-                      listing_element.find('img', src=re.compile(r'i\.ebayimg|gumtree'))
-            
-            image_url = img_elem.get('src') if img_elem else None
+            image_url = cls.node_attr(cls.select_first(listing_element, *cls.image_selectors), 'src')
             
             # Extract seller info
-            seller_elem = listing_element.find('span', class_=re.compile(r'seller')) or \
-                         listing_element.find('div', class_=re.compile(r'seller'))
-            
-            seller_info = seller_elem.get_text(strip=True) if seller_elem else ''
+            seller_info = cls.node_text(cls.select_first(listing_element, *cls.seller_selectors))
             
             # Check for featured/urgent ads
-            is_featured = bool(listing_element.find('span', class_=re.compile(r'featured|urgent')))
+            is_featured = cls.select_one(listing_element, 'span[class*="featured"], span[class*="urgent"]') is not None
             
             return {
                 'title': title,
                 'url': url,
+                'item_id': cls.extract_ad_id(url),
                 'price': price_text,
                 'location': location,
                 'posted_date': posted_date,
@@ -201,33 +254,9 @@ class GumtreeScraper(BaseScraper):
             }
             
         except Exception as e:
-            self.logger.debug(f"Error parsing Gumtree listing element: {e}")
+            logging.getLogger(cls.__name__).debug(f"Error parsing Gumtree listing element: {e}")
             return None
 
-    def _deduplicate_listings(self, listings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """
-        Remove duplicate listings based on URL and title similarity
-        """
-        seen_urls = set()
-        unique_listings = []
-        
-        for listing in listings:
-            url = listing.get('url', '')
-            title = listing.get('title', '')
-            
-            # Use URL as primary deduplication key
-            if url and url not in seen_urls:
-                seen_urls.add(url)
-                unique_listings.append(listing)
-            elif not url:
-                # For listings without URL, use title-based deduplication
-                title_hash = hash(title.lower()[:50])  # First 50 chars
-                if title_hash not in seen_urls:
-                    seen_urls.add(title_hash)
-                    unique_listings.append(listing)
-        
-        return unique_listings
-
     async def get_listing_details(self, listing_url: str) -> Optional[Dict[str, Any]]:
         """
         Fetch detailed information from individual Gumtree listing page
@@ -237,64 +266,72 @@ class GumtreeScraper(BaseScraper):
             if not html_content:
                 return None
             
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # Extract full description
-            desc_elem = soup.find('div', class_=re.compile(r'ad-description')) or \
-                       soup.find('section', class_=re.compile(r'description'))
-            
-            description = desc_elem.get_text(strip=True) if desc_elem else ''
-            
-            # Extract seller information
-            seller_info = {}
-            seller_section = soup.find('div', class_=re.compile(r'seller-info|seller-details'))
-            if seller_section:
-                seller_name = seller_section.find('span', class_=re.compile(r'seller-name'))
-                if seller_name:
-                    seller_info['name'] = seller_name.get_text(strip=True)
-                
-                # Extract join date, verification status, etc.
-                seller_details = seller_section.find_all('span')
-                for detail in seller_details:
-                    text = detail.get_text(strip=True)
-                    if 'member since' in text.lower():
-                        seller_info['member_since'] = text
-                    elif 'verified' in text.lower():
-                        seller_info['verified'] = True
-            
-            # Extract multiple images
-            image_urls = []
-            img_elements = soup.find_all('img', src=re.compile(r'gumtree|apollo'))
-            for img in img_elements:
-                src = img.get('src')
-                if src and 'thumb' not in src and src.startswith('http'):
-                    image_urls.append(src)
-            
-            # Extract ad details/specifications
-            ad_details = {}
-            details_section = soup.find('div', class_=re.compile(r'ad-details|attributes'))
-            if details_section:
-                labels = details_section.find_all('dt') or details_section.find_all('strong')
-                values = details_section.find_all('dd') or details_section.find_all('span')
-                
-                for label, value in zip(labels, values):
-                    key = label.get_text(strip=True).rstrip(':')
-                    val = value.get_text(strip=True)
-                    if key and val:
-                        ad_details[key] = val
-            
-            return {
-                'description': description,
-                'seller_info': seller_info,
-                'image_urls': image_urls,
-                'ad_details': ad_details
-            }
+            return await self.run_parser(self._parse_details, html_content)
             
         except Exception as e:
             self.logger.error(f"Failed to get Gumtree listing details: {e}")
             return None
 
-    def extract_ad_id(self, url: str) -> Optional[str]:
+    @classmethod
+    def _parse_details(cls, html_content: str) -> Dict[str, Any]:
+        """
+        Parse an individual Gumtree listing page
+        A classmethod so it can run in a worker process without pickling the scraper
+        """
+        tree = cls.parse_html(html_content)
+        
+        # Extract full description
+        desc_elem = cls.select_first(tree, 'div[class*="ad-description"]', 'section[class*="description"]')
+        
+        description = cls.node_text(desc_elem)
+        
+        # Extract seller information
+        seller_info = {}
+        seller_section = cls.select_one(tree, 'div[class*="seller-info"], div[class*="seller-details"]')
+        if seller_section is not None:
+            seller_name = cls.select_one(seller_section, 'span[class*="seller-name"]')
+            if seller_name is not None:
+                seller_info['name'] = cls.node_text(seller_name)
+            
+            # Extract join date, verification status, etc.
+            seller_details = cls.select(seller_section, 'span')
+            for detail in seller_details:
+                text = cls.node_text(detail)
+                if 'member since' in text.lower():
+                    seller_info['member_since'] = text
+                elif 'verified' in text.lower():
+                    seller_info['verified'] = True
+        
+        # Extract multiple images
+        image_urls = []
+        img_elements = cls.select(tree, 'img[src*="gumtree"], img[src*="apollo"]')
+        for img in img_elements:
+            src = cls.node_attr(img, 'src')
+            if src and 'thumb' not in src and src.startswith('http'):
+                image_urls.append(src)
+        
+        # Extract ad details/specifications
+        ad_details = {}
+        details_section = cls.select_one(tree, 'div[class*="ad-details"], div[class*="attributes"]')
+        if details_section is not None:
+            labels = cls.select(details_section, 'dt') or cls.select(details_section, 'strong')
+            values = cls.select(details_section, 'dd') or cls.select(details_section, 'span')
+            
+            for label, value in zip(labels, values):
+                key = cls.node_text(label).rstrip(':')
+                val = cls.node_text(value)
+                if key and val:
+                    ad_details[key] = val
+        
+        return {
+            'description': description,
+            'seller_info': seller_info,
+            'image_urls': image_urls,
+            'ad_details': ad_details
+        }
+
+    @classmethod
+    def extract_ad_id(cls, url: str) -> Optional[str]:
         """
         Extract Gumtree ad ID from listing URL
         """
@@ -302,14 +339,12 @@ class GumtreeScraper(BaseScraper):
             return None
         
         # Gumtree URLs typically contain the ad ID
-        match = re.search(r'/ad/(\d+)', url)
-        if match:
-            return match.group(1)
-        
-        # Alternative pattern
-        match = re.search(r'adId=(\d+)', url)
-        if match:
-            return match.group(1)
+        for prefix, pattern in cls.ad_id_patterns:
+            if prefix not in url:
+                continue
+            match = pattern.search(url)
+            if match:
+                return match.group(1)
         
         return None
 
@@ -6,17 +6,24 @@ Coordinates scraping across multiple UK marketplaces for GPU listings
 
 import asyncio
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Any
 
+import aiohttp
+
 from config.settings import ScraperConfig
 from scrapers.ebay_scraper import EBayScraper
 from scrapers.facebook_scraper import FacebookScraper
 from scrapers.gumtree_scraper import GumtreeScraper
 from data.standardizer import GPUDataStandardizer
 from export.excel_exporter import ExcelExporter
+from scrapers.base_scraper import BaseScraper
 from utils.compliance_checker import ComplianceChecker
+from utils.deduplicator import Deduplicator
+from utils import event_loop
 from utils.logger import setup_logging
 
 
@@ -46,80 +53,92 @@ class GPUScraper:
             'gumtree': 'https://www.gumtree.com'
         }
         
-        compliance_results = {}
-        for site_name, url in sites.items():
-            try:
-                result = await self.compliance_checker.check_site_compliance(url)
-                compliance_results[site_name] = result
+        # Sites are checked concurrently over the checker's shared session; results
+        # keep the order of sites
+        async with self.compliance_checker:
+            results = await asyncio.gather(*(self._check_site(site_name, url) for site_name, url in sites.items()))
+        return dict(zip(sites, results))
+
+    async def _check_site(self, site_name: str, url: str) -> Dict[str, Any]:
+        """Check one site's compliance, logging any concerns"""
+        try:
+            result = await self.compliance_checker.check_site_compliance(url)
+            
+            if not result['robots_allowed']:
+                self.logger.warning(f"{site_name}: Robots.txt disallows scraping")
+            if result['tos_concerns']:
+                self.logger.warning(f"{site_name}: ToS concerns found: {result['tos_concerns']}")
+            
+            return result
                 
-                if not result['robots_allowed']:
-                    self.logger.warning(f"{site_name}: Robots.txt disallows scraping")
-                if result['tos_concerns']:
-                    self.logger.warning(f"{site_name}: ToS concerns found: {result['tos_concerns']}")
-                    
-            except Exception as e:
-                self.logger.error(f"Failed to check compliance for {site_name}: {e}")
-                compliance_results[site_name] = {'error': str(e)}
-        
-        return compliance_results
+        except Exception as e:
+            self.logger.error(f"Failed to check compliance for {site_name}: {e}")
+            return {'error': str(e)}
 
     async def scrape_all_sites(self) -> List[Dict[str, Any]]:
         """Coordinate scraping across all enabled marketplaces"""
         self.logger.info("Starting GPU scraping across all marketplaces...")
         
-        all_listings = []
-        
+        enabled = {}
         for scraper_name, scraper in self.scrapers.items():
             if not self.config.is_scraper_enabled(scraper_name):
                 self.logger.info(f"Skipping {scraper_name} (disabled in config)")
                 continue
-                
-            try:
-                self.logger.info(f"Scraping {scraper_name}...")
-                listings = await scraper.scrape_gpu_listings()
-                
-                for listing in listings:
-                    listing['source'] = scraper_name
-                    listing['scraped_at'] = datetime.now().isoformat()
-                
-                all_listings.extend(listings)
-                self.logger.info(f"Found {len(listings)} listings from {scraper_name}")
-                
-            except Exception as e:
-                self.logger.error(f"Error scraping {scraper_name}: {e}")
-                continue
+            enabled[scraper_name] = scraper
+        
+        # Each marketplace is a different host, so they are scraped concurrently;
+        # listings are combined in the order the scrapers are listed
+        results = await asyncio.gather(*(
+            self._scrape_site(scraper_name, scraper) for scraper_name, scraper in enabled.items()
+        ))
+        
+        all_listings = []
+        for listings in results:
+            all_listings.extend(listings)
         
         return all_listings
 
+    async def _scrape_site(self, scraper_name: str, scraper) -> List[Dict[str, Any]]:
+        """Scrape one marketplace and tag its listings; errors are logged and give no listings"""
+        try:
+            self.logger.info(f"Scraping {scraper_name}...")
+            listings = await scraper.scrape_gpu_listings()
+            
+            scraped_at = datetime.now().isoformat()
+            for listing in listings:
+                listing['source'] = scraper_name
+                listing['scraped_at'] = scraped_at
+            
+            self.logger.info(f"Found {len(listings)} listings from {scraper_name}")
+            return listings
+            
+        except Exception as e:
+            self.logger.error(f"Error scraping {scraper_name}: {e}")
+            return []
+
     def standardize_data(self, raw_listings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Standardize and clean the scraped data"""
         self.logger.info(f"Standardizing {len(raw_listings)} raw listings...")
         
-        standardized_listings = []
-        for listing in raw_listings:
-            try:
-                standardized = self.standardizer.standardize_listing(listing)
-                if standardized:
-                    standardized_listings.append(standardized)
-            except Exception as e:
-                self.logger.warning(f"Failed to standardize listing: {e}")
-                continue
+        standardized_listings = self.standardizer.standardize_listings(raw_listings)
         
         self.logger.info(f"Successfully standardized {len(standardized_listings)} listings")
         return standardized_listings
 
     def remove_duplicates(self, listings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Remove duplicate listings based on URL and title similarity"""
+        """
+        Remove listings that duplicate one from another site, or that have no URL
+        Each scraper already drops its own duplicates while scraping
+        """
         self.logger.info("Removing duplicate listings...")
         
-        seen_urls = set()
-        unique_listings = []
-        
-        for listing in listings:
-            url = listing.get('url', '')
-            if url and url not in seen_urls:
-                seen_urls.add(url)
-                unique_listings.append(listing)
+        # URLs are compared whole: some sites tell ads apart only by the query string
+        # (?adId=..., ?item=...), so stripping it would merge different ads
+        deduplicator = Deduplicator()
+        unique_listings = [
+            listing for listing in listings
+            if listing.get('url') and deduplicator.register(listing['url'], 'url')
+        ]
         
         removed_count = len(listings) - len(unique_listings)
         self.logger.info(f"Removed {removed_count} duplicate listings")
@@ -136,21 +155,47 @@ class GPUScraper:
             compliance_results = await self.check_compliance()
             self.logger.info("Compliance check completed")
             
-            # Scrape all sites
-            raw_listings = await self.scrape_all_sites()
+            # Scrape all sites over one shared session so keep-alive connections and
+            # the DNS cache are reused across marketplaces, and one shared pool of
+            # parsing processes rather than a pool per site
+            connector = aiohttp.TCPConnector(
+                limit=256,
+                limit_per_host=64,
+                keepalive_timeout=30,
+                ttl_dns_cache=300
+            )
+            parse_workers = getattr(self.config.limits, 'parse_workers', os.cpu_count())
+            parse_pool = ProcessPoolExecutor(max_workers=parse_workers) if parse_workers else None
+            async with BaseScraper.open_session(self.config, connector) as session:
+                for scraper in self.scrapers.values():
+                    scraper.session = session
+                    scraper.parse_pool = parse_pool
+                try:
+                    raw_listings = await self.scrape_all_sites()
+                finally:
+                    for scraper in self.scrapers.values():
+                        scraper.session = None
+                        scraper.parse_pool = None
+                    if parse_pool is not None:
+                        parse_pool.shutdown()
             
             if not raw_listings:
                 self.logger.warning("No listings found across all sites")
                 return "No data scraped"
             
-            # Standardize data
-            standardized_listings = self.standardize_data(raw_listings)
+            # Remove duplicates first so they are never standardized. Only repeats of
+            # the exact same URL are dropped, and the first raw copy is the one kept,
+            # even if it then fails standardization where a later copy would have
+            # passed
+            unique_listings = self.remove_duplicates(raw_listings)
             
-            # Remove duplicates
-            final_listings = self.remove_duplicates(standardized_listings)
+            # Standardize data
+            final_listings = self.standardize_data(unique_listings)
             
-            # Export to Excel
-            output_file = self.exporter.export_to_excel(
+            # Export to Excel in a worker thread so the event loop isn't blocked
+            output_file = await asyncio.get_running_loop().run_in_executor(
+                None,
+                self.exporter.export_to_excel,
                 final_listings, 
                 compliance_results
             )
@@ -183,4 +228,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    event_loop.run(main())
\ No newline at end of file
@@ -4,7 +4,6 @@ GPU Scraper Pipeline Test
 Tests the complete scraping pipeline with a limited scope
 """
 
-import asyncio
 import sys
 import logging
 from pathlib import Path
@@ -14,6 +13,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from src.main import GPUScraper
 from config.settings import ScraperConfig
+from utils import event_loop
 
 
 async def test_pipeline():
@@ -201,5 +201,5 @@ async def main():
 
 
 if __name__ == "__main__":
-    exit_code = asyncio.run(main())
+    exit_code = event_loop.run(main())
     sys.exit(exit_code)
\ No newline at end of file
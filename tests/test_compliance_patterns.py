@@ -0,0 +1,103 @@
+"""
+Tests for the ToS word-sequence matching in ComplianceChecker
+"""
+
+import random
+import re
+import sys
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.compliance_checker import ComplianceChecker, _compile_word_sequence, _contains_word_sequence
+
+SEQUENCES = ComplianceChecker.tos_red_flags + ComplianceChecker.rate_limit_indicators
+
+# Every word of every sequence in mixed case, plus separators that do and don't
+# end a line for '.'
+PIECES = sorted({
+    word for sequence in SEQUENCES for word in sequence.split('.*')
+}) + ['AUTOMATED', 'Access', 'Prohibited', 'Rate', ' ', ' ', '\n', '\r', '\t', 'x', 'é']
+
+
+def random_texts(count, seed=0):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield ''.join(rng.choice(PIECES) for _ in range(rng.randint(0, 14)))
+
+
+class TestWordSequences(unittest.TestCase):
+    def test_matches_plain_regex_search(self):
+        # The patterns replace re.search(sequence, text, re.IGNORECASE); they must
+        # agree with it on every text
+        compiled = [(sequence, _compile_word_sequence(sequence)) for sequence in SEQUENCES]
+        for text in random_texts(20000):
+            for sequence, words in compiled:
+                self.assertEqual(
+                    _contains_word_sequence(words, text),
+                    re.search(sequence, text, re.IGNORECASE) is not None,
+                    (sequence, text)
+                )
+
+    def test_words_must_share_a_line(self):
+        words = _compile_word_sequence('bots.*prohibited')
+        self.assertTrue(_contains_word_sequence(words, 'Bots are PROHIBITED'))
+        self.assertFalse(_contains_word_sequence(words, 'bots\nprohibited'))
+        self.assertFalse(_contains_word_sequence(words, 'prohibited bots'))
+        self.assertTrue(_contains_word_sequence(words, 'prohibited bots\nbots prohibited'))
+
+    def test_long_line_without_match_is_fast(self):
+        # A single backtracking regex is superlinear on this line; the word walk is linear
+        words = _compile_word_sequence('automated.*access.*prohibited')
+        text = 'automated access ' * 100000
+        start = time.perf_counter()
+        self.assertFalse(_contains_word_sequence(words, text))
+        self.assertLess(time.perf_counter() - start, 2.0)
+
+    @unittest.skipIf(ComplianceChecker.tos_red_flag_database is None, 'hyperscan not installed')
+    def test_hyperscan_agrees_with_word_walk(self):
+        for database, patterns in (
+            (ComplianceChecker.tos_red_flag_database, ComplianceChecker.tos_red_flag_patterns),
+            (ComplianceChecker.rate_limit_database, ComplianceChecker.rate_limit_patterns),
+        ):
+            for text in random_texts(5000, seed=1):
+                text = text.replace('é', 'e')  # Hyperscan's caseless mode is ASCII only
+                self.assertEqual(
+                    ComplianceChecker._find_word_sequences(database, patterns, text),
+                    ComplianceChecker._find_word_sequences(None, patterns, text),
+                    text
+                )
+
+
+class TestExtractors(unittest.TestCase):
+    def setUp(self):
+        self.checker = ComplianceChecker()
+
+    def test_tos_concerns(self):
+        concerns = self.checker._extract_tos_concerns(
+            "Automated ACCESS to the site is Prohibited.\nScraping is NOT allowed here."
+        )
+        self.assertEqual(concerns, [
+            'ToS restriction found: automated.*access.*prohibited',
+            'ToS restriction found: scraping.*not.*allowed',
+            'Terms explicitly mention scraping/crawling restrictions',
+            'Automated access appears to be prohibited',
+        ])
+
+    def test_rate_limits(self):
+        rate_limits = self.checker._extract_rate_limits("Rate Limit: 10 Requests per MINUTE")
+        self.assertEqual(rate_limits, [
+            'Rate limiting mentioned: rate.*limit',
+            'Rate limiting mentioned: requests.*per.*minute',
+            'Rate limit: 10 requests per minute',
+        ])
+
+    def test_clean_terms(self):
+        self.assertEqual(self.checker._extract_tos_concerns("Be nice to other users."), [])
+        self.assertEqual(self.checker._extract_rate_limits("Be nice to other users."), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+Tests for listing deduplication
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.deduplicator import Deduplicator
+
+
+class TestListingKey(unittest.TestCase):
+    def test_item_id_takes_precedence(self):
+        listing = {'item_id': '123', 'url': 'https://www.ebay.co.uk/itm/123', 'title': 'RTX 4070'}
+        self.assertEqual(Deduplicator.listing_key(listing), ('item', '123'))
+
+    def test_url_used_without_item_id(self):
+        listing = {'url': 'https://www.ebay.co.uk/itm/123?hash=abc', 'title': 'RTX 4070'}
+        self.assertEqual(Deduplicator.listing_key(listing), ('url', 'https://www.ebay.co.uk/itm/123'))
+
+    def test_title_used_without_url(self):
+        listing = {'item_id': '', 'url': None, 'title': 'MSI RTX 4070 - Gaming X!'}
+        self.assertEqual(Deduplicator.listing_key(listing), ('title', 'msirtx4070gamingx'))
+
+    def test_title_key_is_truncated(self):
+        self.assertEqual(len(Deduplicator.title_key('a' * 80)), 50)
+
+
+class TestNormalizeUrl(unittest.TestCase):
+    def test_host_lowercased_path_kept(self):
+        self.assertEqual(
+            Deduplicator.normalize_url('https://WWW.Gumtree.com/p/Graphics-Cards/RTX/1'),
+            'https://www.gumtree.com/p/Graphics-Cards/RTX/1'
+        )
+
+    def test_query_and_fragment_removed(self):
+        self.assertEqual(
+            Deduplicator.normalize_url('https://www.ebay.co.uk/itm/123?_trkparms=x&hash=y#tab'),
+            'https://www.ebay.co.uk/itm/123'
+        )
+
+
+class TestRegister(unittest.TestCase):
+    def test_repeat_is_rejected(self):
+        deduplicator = Deduplicator()
+        self.assertTrue(deduplicator.register('https://example.com/1', 'url'))
+        self.assertFalse(deduplicator.register('https://example.com/1', 'url'))
+        self.assertEqual(len(deduplicator), 1)
+
+    def test_kinds_are_kept_apart(self):
+        deduplicator = Deduplicator()
+        self.assertTrue(deduplicator.register('123', 'item'))
+        self.assertTrue(deduplicator.register('123', 'title'))
+
+    def test_tracking_parameters_do_not_defeat_dedup(self):
+        deduplicator = Deduplicator()
+        self.assertTrue(deduplicator.register_listing({'url': 'https://example.com/ad/1?utm_source=a'}))
+        self.assertFalse(deduplicator.register_listing({'url': 'https://EXAMPLE.com/ad/1?utm_source=b'}))
+
+    def test_hash_is_stable(self):
+        self.assertEqual(Deduplicator.hash_key('abc'), Deduplicator.hash_key('abc'))
+        self.assertNotEqual(Deduplicator.hash_key('abc'), Deduplicator.hash_key('abd'))
+
+
+if __name__ == '__main__':
+    unittest.main()
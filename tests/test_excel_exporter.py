@@ -0,0 +1,97 @@
+"""
+Tests for ExcelExporter exports
+"""
+
+import asyncio
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+
+from openpyxl import load_workbook
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from export import excel_exporter
+from export.excel_exporter import ExcelExporter
+
+LISTINGS = [{'title': 'RTX 4070', 'marketplace': 'eBay UK', 'price': '£450', 'standardized_price': 450.0}]
+
+
+class TestExportTimestamp(unittest.TestCase):
+    def setUp(self):
+        output_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(output_dir.cleanup)
+        self.output_dir = output_dir.name
+
+    def test_reused_exporter_writes_new_files(self):
+        # GPUScraper keeps one exporter, so each run's export needs its own time
+        times = iter([datetime(2026, 1, 1, 9, 0, 0), datetime(2026, 1, 1, 10, 30, 0)])
+        exporter = ExcelExporter(self.output_dir)
+        with mock.patch.object(excel_exporter, 'datetime', mock.Mock(now=lambda: next(times))):
+            first = exporter.export_to_csv(LISTINGS)
+            second = exporter.export_to_csv(LISTINGS)
+        self.assertEqual(Path(first).name, 'gpu_listings_20260101_090000.csv')
+        self.assertEqual(Path(second).name, 'gpu_listings_20260101_103000.csv')
+
+    def test_timestamp_override_is_kept(self):
+        exporter = ExcelExporter(self.output_dir, timestamp=datetime(2026, 3, 4, 5, 6, 7))
+        self.assertEqual(Path(exporter.export_to_csv(LISTINGS)).name, 'gpu_listings_20260304_050607.csv')
+        self.assertEqual(Path(exporter.export_to_excel(LISTINGS)).name, 'gpu_listings_20260304_050607.xlsx')
+        self.assertEqual(exporter.create_summary_report(LISTINGS)['scraping_date'], '2026-03-04T05:06:07')
+
+
+class TestExportStream(unittest.TestCase):
+    def sheet_values(self, filepath, name):
+        return [list(row) for row in load_workbook(filepath)[name].iter_rows(values_only=True)]
+
+    def test_stream_and_batch_summaries_match(self):
+        listings = [
+            {'title': 'RTX 4070', 'marketplace': 'eBay UK', 'gpu_model': '4070', 'condition': 'Used',
+             'price': '£450', 'standardized_price': 450.0},
+            {'title': 'RTX 4070', 'marketplace': 'Gumtree UK', 'gpu_model': '4070', 'condition': 'New',
+             'price': 430, 'standardized_price': None},
+            {'title': 'RX 7800 XT', 'marketplace': 'eBay UK', 'gpu_model': 'RX 7800 XT',
+             'price': 'offers', 'standardized_price': 380},
+            {'title': 'Arc B580', 'marketplace': 'eBay UK', 'price': '£0', 'standardized_price': 0},
+            {'title': 'RTX 3060', 'price': 'n/a', 'standardized_price': 'n/a'},
+        ]
+        timestamp = datetime(2026, 5, 6, 7, 8, 9)
+        with tempfile.TemporaryDirectory() as batch_dir, tempfile.TemporaryDirectory() as stream_dir:
+            batch_file = ExcelExporter(batch_dir, timestamp=timestamp).export_to_excel(listings)
+
+            async def stream():
+                queue = asyncio.Queue()
+                for listing in listings + [None]:
+                    queue.put_nowait(listing)
+                return await ExcelExporter(stream_dir, timestamp=timestamp).export_stream(queue)
+
+            stream_file = asyncio.run(stream())
+            for name in ('Summary', 'Price Analysis'):
+                with self.subTest(sheet=name):
+                    self.assertEqual(self.sheet_values(stream_file, name), self.sheet_values(batch_file, name))
+
+
+@unittest.skipIf(excel_exporter.pa is None, 'pyarrow not installed')
+class TestExportToParquet(unittest.TestCase):
+    def test_round_trip_with_mixed_types(self):
+        listings = [
+            {'title': 'RTX 4070', 'price': 450, 'condition': 'Used', 'standardized_price': 450.0},
+            {'title': 'RX 7800 XT', 'price': '£380.00', 'condition': 3, 'location': 'Leeds'},
+            {'title': 'Arc B580', 'price': None, 'condition': None, 'standardized_price': 230},
+        ]
+        with tempfile.TemporaryDirectory() as output_dir:
+            filepath = ExcelExporter(output_dir).export_to_parquet(listings)
+            table = excel_exporter.pq.read_table(filepath)
+        self.assertEqual(table.column_names, ['title', 'price', 'condition', 'standardized_price', 'location'])
+        self.assertEqual(table.to_pylist(), [
+            {'title': 'RTX 4070', 'price': '450', 'condition': 'Used', 'standardized_price': 450.0, 'location': None},
+            {'title': 'RX 7800 XT', 'price': '£380.00', 'condition': '3', 'standardized_price': None, 'location': 'Leeds'},
+            {'title': 'Arc B580', 'price': None, 'condition': None, 'standardized_price': 230.0, 'location': None},
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
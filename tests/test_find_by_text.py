@@ -0,0 +1,86 @@
+"""
+Tests for text-matched element lookup on both HTML backends
+"""
+
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scrapers import base_scraper
+from scrapers.facebook_scraper import FacebookScraper
+from scrapers.gumtree_scraper import GumtreeScraper
+
+# Facebook wraps a card's fields in layers of spans; the outer span's text is all
+# of the fields run together
+NESTED_CARD = '''
+<div data-testid="marketplace-item">
+  <a href="/marketplace/item/123/">
+    <span class="card">
+      <span><span>£300</span></span>
+      <span><span>RTX 3080 FE</span></span>
+      <span><span>Leeds · 5 miles away</span></span>
+    </span>
+  </a>
+</div>
+'''
+
+
+def make_scraper():
+    limits = SimpleNamespace(request_delay=0.0, timeout=10, max_pages=5, parse_workers=0)
+    return FacebookScraper(SimpleNamespace(limits=limits))
+
+
+def backends():
+    """selectolax when it is installed, then BeautifulSoup"""
+    parsers = {'beautifulsoup': None}
+    if base_scraper.LexborHTMLParser is not None:
+        parsers['selectolax'] = base_scraper.LexborHTMLParser
+    return parsers.items()
+
+
+class TestFindByText(unittest.TestCase):
+    def test_skips_wrapping_spans(self):
+        for backend, parser in backends():
+            with self.subTest(backend=backend), mock.patch.object(base_scraper, 'LexborHTMLParser', parser):
+                scraper = make_scraper()
+                card = scraper.select_one(scraper.parse_html(NESTED_CARD), 'div[data-testid="marketplace-item"]')
+                match = scraper.find_by_text(card, 'span', scraper.title_text_pattern)
+                self.assertEqual(scraper.node_text(match), 'RTX 3080 FE')
+
+    def test_no_leaf_match(self):
+        for backend, parser in backends():
+            with self.subTest(backend=backend), mock.patch.object(base_scraper, 'LexborHTMLParser', parser):
+                scraper = make_scraper()
+                tree = scraper.parse_html('<div><span>RTX <b>3080</b></span></div>')
+                self.assertIsNone(scraper.find_by_text(tree, 'span', scraper.title_text_pattern))
+
+    def test_facebook_card_fields(self):
+        for backend, parser in backends():
+            with self.subTest(backend=backend), mock.patch.object(base_scraper, 'LexborHTMLParser', parser):
+                scraper = make_scraper()
+                card = scraper.select_one(scraper.parse_html(NESTED_CARD), 'div[data-testid="marketplace-item"]')
+                listing = scraper.parse_listing(card)
+                self.assertEqual(listing['title'], 'RTX 3080 FE')
+                self.assertEqual(listing['price'], '£300')
+                self.assertEqual(listing['location'], 'Leeds · 5 miles away')
+
+    def test_gumtree_price_fallback(self):
+        for backend, parser in backends():
+            with self.subTest(backend=backend), mock.patch.object(base_scraper, 'LexborHTMLParser', parser):
+                card = '''
+                <article class="listing-maxi">
+                  <a class="listing-link" href="/p/graphics-cards/rtx-4070/1001">RTX 4070</a>
+                  <span class="meta"><span>£450</span><span>Manchester</span></span>
+                </article>
+                '''
+                tree = GumtreeScraper.parse_html(card)
+                listing = GumtreeScraper.parse_listing(GumtreeScraper.select_one(tree, 'article'))
+                self.assertEqual(listing['price'], '£450')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+Tests for GPU indicator matching in BaseScraper
+"""
+
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scrapers.base_scraper import BaseScraper
+
+
+class StubScraper(BaseScraper):
+    async def scrape_gpu_listings(self):
+        return []
+
+    def parse_listing(self, listing_element):
+        return None
+
+
+def make_scraper():
+    limits = SimpleNamespace(request_delay=0.0, timeout=10, parse_workers=0)
+    return StubScraper(SimpleNamespace(limits=limits))
+
+
+# Multi-byte titles move byte offsets away from character offsets, and matches
+# at the very start or end of a title sit next to the joining newlines
+TITLES = [
+    'NVIDIA RTX 4070',
+    'Office chair',
+    'Café table – good condition 🙂',
+    'rtx',
+    'Radeon',
+    '',
+    'ÉCRAN 27" avec câble',
+    'Graphics Card 🙂🙂',
+    'Oak desk',
+    'gpu',
+]
+
+
+class TestFilterGpuListings(unittest.TestCase):
+    def setUp(self):
+        self.scraper = make_scraper()
+
+    def test_matches_per_title_check(self):
+        expected = [self.scraper._has_gpu_indicator(title.lower()) for title in TITLES]
+        self.assertEqual(self.scraper.filter_gpu_listings(TITLES), expected)
+        self.assertEqual(expected, [True, False, False, True, True, False, False, True, False, True])
+
+    def test_empty_page(self):
+        self.assertEqual(self.scraper.filter_gpu_listings([]), [])
+
+    @unittest.skipIf(BaseScraper.gpu_indicator_database is None, 'hyperscan not installed')
+    def test_hyperscan_offsets_map_to_titles(self):
+        # Every single-title rotation puts each title at every position in the page
+        for shift in range(len(TITLES)):
+            titles = TITLES[shift:] + TITLES[:shift]
+            expected = [self.scraper._has_gpu_indicator(title.lower()) for title in titles]
+            self.assertEqual(self.scraper.filter_gpu_listings(titles), expected)
+
+
+class TestIndicatorBackends(unittest.TestCase):
+    """Every available matcher must classify the same titles the same way"""
+
+    def backends(self):
+        backends = {'regex': make_scraper()}
+        backends['regex'].gpu_indicator_database = None
+        if BaseScraper.gpu_indicator_database is not None:
+            backends['hyperscan'] = make_scraper()
+        return backends
+
+    def test_backends_agree(self):
+        titles = TITLES + ['ARC A770', 'Rx 580', 'rx580', 'Video Card', 'AMD', 'Intel NUC', 'tv cabinet']
+        expected = [make_scraper().is_gpu_listing(title) for title in titles]
+        for name, scraper in self.backends().items():
+            with self.subTest(backend=name):
+                self.assertEqual(scraper.filter_gpu_listings(titles), expected)
+                self.assertEqual([scraper.is_gpu_listing(title) for title in titles], expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
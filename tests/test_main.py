@@ -0,0 +1,53 @@
+"""
+Tests for the GPUScraper orchestrator
+"""
+
+import importlib.util
+import logging
+import sys
+import unittest
+from pathlib import Path
+from types import ModuleType
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# The config package isn't in every checkout. These tests never build a
+# ScraperConfig, so without it a placeholder module is enough to import src.main
+if importlib.util.find_spec('config') is None:
+    settings = ModuleType('config.settings')
+    settings.ScraperConfig = None
+    sys.modules['config'] = ModuleType('config')
+    sys.modules['config.settings'] = settings
+
+from src.main import GPUScraper
+
+
+def remove_duplicates(listings):
+    # remove_duplicates only needs a logger, so the scrapers and config are skipped
+    scraper = GPUScraper.__new__(GPUScraper)
+    scraper.logger = logging.getLogger(__name__)
+    return scraper.remove_duplicates(listings)
+
+
+class TestRemoveDuplicates(unittest.TestCase):
+    def test_ads_told_apart_by_query_string_are_kept(self):
+        listings = [
+            {'title': 'RTX 4070', 'url': 'https://www.gumtree.com/p/graphics-cards?adId=1001'},
+            {'title': 'RTX 4070', 'url': 'https://www.gumtree.com/p/graphics-cards?adId=1002'},
+            {'title': 'RTX 3080', 'url': 'https://www.ebay.co.uk/itm/?item=2001'},
+            {'title': 'RTX 3080', 'url': 'https://www.ebay.co.uk/itm/?item=2002'},
+        ]
+        self.assertEqual(remove_duplicates(listings), listings)
+
+    def test_repeated_url_keeps_first_copy(self):
+        first = {'title': 'RTX 4070', 'url': 'https://www.gumtree.com/p/graphics-cards?adId=1001'}
+        repeat = {'title': 'RTX 4070 12GB', 'url': 'https://www.gumtree.com/p/graphics-cards?adId=1001'}
+        self.assertEqual(remove_duplicates([first, repeat]), [first])
+
+    def test_listings_without_url_are_dropped(self):
+        listing = {'title': 'RTX 4070', 'url': 'https://www.ebay.co.uk/itm/123'}
+        self.assertEqual(remove_duplicates([{'title': 'RTX 4070'}, listing, {'title': 'RX 7800', 'url': ''}]), [listing])
+
+
+if __name__ == '__main__':
+    unittest.main()
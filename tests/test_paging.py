@@ -0,0 +1,143 @@
+"""
+Tests for search result paging
+"""
+
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scrapers.ebay_scraper import EBayScraper
+from scrapers.gumtree_scraper import GumtreeScraper
+
+
+def make_scraper(request_delay=0.0, scraper_class=GumtreeScraper):
+    limits = SimpleNamespace(
+        request_delay=request_delay, timeout=10, max_pages=5,
+        max_results_per_site=1000, parse_workers=0
+    )
+    return scraper_class(SimpleNamespace(limits=limits))
+
+
+def cards(ad_ids):
+    """Parsed cards for a results page, one per ad ID"""
+    return [
+        {'title': f'RTX 4070 #{ad_id}', 'url': f'https://example.com/ad/{ad_id}', 'item_id': str(ad_id)}
+        for ad_id in ad_ids
+    ]
+
+
+class FakeResponse:
+    status = 200
+    charset = 'utf-8'
+
+    async def read(self):
+        return b'<html></html>'
+
+
+class FakeSession:
+    """Records when each GET starts and how many are open at once"""
+
+    def __init__(self):
+        self.started = []
+        self.open = 0
+        self.max_open = 0
+
+    def get(self, url, **kwargs):
+        return FakeRequest(self)
+
+
+class FakeRequest:
+    def __init__(self, session):
+        self.session = session
+
+    async def __aenter__(self):
+        self.session.started.append(asyncio.get_running_loop().time())
+        self.session.open += 1
+        self.session.max_open = max(self.session.max_open, self.session.open)
+        await asyncio.sleep(0.01)
+        return FakeResponse()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.session.open -= 1
+
+
+class TestSearchPaging(unittest.TestCase):
+    scraper_class = GumtreeScraper
+    page_marker = 'listing-maxi'
+    results_per_page = 20
+
+    def run_search(self, pages, scraper=None):
+        """Run _search_gpu_term with page N parsing to the cards in pages[N - 1]"""
+        scraper = scraper or make_scraper(scraper_class=self.scraper_class)
+        requested_pages = []
+
+        async def make_request(url):
+            requested_pages.append(int(url.rsplit('=', 1)[1]))
+            return f'<div class="{self.page_marker}"></div>'
+
+        # Only the card parser is replaced, so GPU filtering and deduplication run
+        scraper.make_request = make_request
+        scraper._parse_page = lambda html_content: pages[requested_pages[-1] - 1]
+        listings = asyncio.run(scraper._search_gpu_term('RTX 4070'))
+        return requested_pages, listings
+
+    def page_of(self, size, start):
+        return cards(range(start, start + size))
+
+    def test_stops_at_first_short_page(self):
+        # Three pages of results: nothing is requested past the short third page
+        full = self.results_per_page
+        pages = [self.page_of(full, 0), self.page_of(full, 1000), self.page_of(7, 2000),
+                 self.page_of(full, 3000), self.page_of(full, 4000)]
+        requested_pages, listings = self.run_search(pages)
+        self.assertEqual(requested_pages, [1, 2, 3])
+        self.assertEqual(len(listings), 2 * full + 7)
+
+    def test_full_pages_run_to_max_pages(self):
+        full = self.results_per_page
+        requested_pages, listings = self.run_search([self.page_of(full, 1000 * page) for page in range(5)])
+        self.assertEqual(requested_pages, [1, 2, 3, 4, 5])
+        self.assertEqual(len(listings), 5 * full)
+
+    def test_full_page_with_duplicates_is_not_the_last(self):
+        # Page 2 is full, but five of its cards were already found by another search
+        # term. Paging goes by cards on the page, not by the listings kept from it
+        full = self.results_per_page
+        scraper = make_scraper(scraper_class=self.scraper_class)
+        for listing in cards(range(5000, 5005)):
+            scraper.deduplicator.register_listing(listing)
+        pages = [self.page_of(full, 0), cards(range(5000, 5000 + full)), self.page_of(3, 2000)]
+        requested_pages, listings = self.run_search(pages, scraper)
+        self.assertEqual(requested_pages, [1, 2, 3])
+        self.assertEqual(len(listings), 2 * full - 5 + 3)
+
+
+class TestEBaySearchPaging(TestSearchPaging):
+    scraper_class = EBayScraper
+    page_marker = 's-item'
+    results_per_page = 50
+
+
+class TestPerHostLimit(unittest.TestCase):
+    def test_concurrent_requests_to_one_host_are_serialized(self):
+        # Gathering pages for one host gains nothing: make_request still sends them
+        # one at a time, request_interval apart
+        scraper = make_scraper(request_delay=0.05)
+        scraper.session = session = FakeSession()
+        urls = [f'https://www.gumtree.com/search?q=rtx&page={page}' for page in range(1, 5)]
+
+        async def fetch_all():
+            return await asyncio.gather(*map(scraper.make_request, urls))
+
+        self.assertEqual(asyncio.run(fetch_all()), ['<html></html>'] * 4)
+        self.assertEqual(session.max_open, 1)
+        gaps = [later - earlier for earlier, later in zip(session.started, session.started[1:])]
+        self.assertTrue(all(gap >= 0.045 for gap in gaps), gaps)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,43 +4,259 @@ Analyzes website policies to ensure ethical scraping practices
 """
 
 import asyncio
+import html
 import logging
 import re
-from typing import Dict, List, Any, Optional
+import sys
+import time
+from pathlib import Path
+from types import MappingProxyType
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from urllib.robotparser import RobotFileParser
 from urllib.parse import urljoin, urlparse
 import aiohttp
 
+try:
+    import hyperscan
+except ImportError:  # Optional accelerator for ToS scanning
+    hyperscan = None
+
+try:
+    from protego import Protego
+except ImportError:  # Optional faster robots.txt parser
+    Protego = None
+
+
+def _compile_word_sequence(sequence: str) -> Tuple[re.Pattern, ...]:
+    """
+    Compile a 'first.*second.*third' sequence into one caseless pattern per word,
+    for _contains_word_sequence. A single regex would backtrack catastrophically
+    on long lines holding the early words but not the last
+    """
+    return tuple(re.compile(word, re.IGNORECASE) for word in sequence.split('.*'))
+
+
+def _contains_word_sequence(words: Tuple[re.Pattern, ...], text: str) -> bool:
+    """
+    Whether some line of text has the words of a sequence in order. Each word is
+    taken at its first occurrence after the one before, which finds a match if
+    there is one; when a word is missing, no later start on that line can do
+    better, so the search moves on to the next line. Runs in linear time
+    """
+    first, *rest = words
+    pos = 0
+    while True:
+        match = first.search(text, pos)
+        if match is None:
+            return False
+        line_end = text.find('\n', match.end())
+        if line_end == -1:
+            line_end = len(text)
+        
+        for word in rest:
+            match = word.search(text, match.end(), line_end)
+            if match is None:
+                break
+        else:
+            return True
+        pos = line_end + 1
+
+
+def _compile_sequence_database(sequences):
+    """
+    Compile 'first.*second' word sequences into a caseless Hyperscan database that
+    reports each sequence at most once. Hyperscan's '.' doesn't match a newline, so
+    as with the regexes the words must be on one line
+    Returns None when the optional hyperscan package is not installed
+    """
+    if hyperscan is None:
+        return None
+    
+    database = hyperscan.Database()
+    database.compile(
+        expressions=[sequence.encode() for sequence in sequences],
+        ids=list(range(len(sequences))),
+        elements=len(sequences),
+        flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(sequences),
+    )
+    return database
+
 
 class ComplianceChecker:
+    # Patterns are compiled once at class definition time and shared by all checkers
+    
+    # Common ToS violation indicators: words that must appear in this order on one
+    # line, in any case. All of them are found in one pass by Hyperscan when it is
+    # installed, otherwise each is searched for word by word
+    tos_red_flags = (
+        r'automated.*access.*prohibited',
+        r'scraping.*not.*allowed',
+        r'data.*mining.*forbidden',
+        r'bots.*prohibited',
+        r'crawling.*unauthorized',
+        r'systematic.*downloading.*prohibited',
+        r'robots.*not.*permitted',
+        r'harvesting.*data.*illegal'
+    )
+    tos_red_flag_patterns = tuple(_compile_word_sequence(flag) for flag in tos_red_flags)
+    tos_red_flag_database = _compile_sequence_database(tos_red_flags)
+    
+    # Concern texts are built once and shared, so a batch of results holds
+    # references to the same few strings rather than a new copy per site
+    tos_red_flag_concerns = tuple(f"ToS restriction found: {flag}" for flag in tos_red_flags)
+    scraping_mention_concern = "Terms explicitly mention scraping/crawling restrictions"
+    automated_prohibited_concern = "Automated access appears to be prohibited"
+    
+    # Rate limiting indicators, in the same form
+    rate_limit_indicators = (
+        r'rate.*limit',
+        r'requests.*per.*minute',
+        r'api.*throttling',
+        r'excessive.*requests'
+    )
+    rate_limit_patterns = tuple(_compile_word_sequence(indicator) for indicator in rate_limit_indicators)
+    rate_limit_database = _compile_sequence_database(rate_limit_indicators)
+    rate_limit_mentions = tuple(f"Rate limiting mentioned: {indicator}" for indicator in rate_limit_indicators)
+    rate_number_pattern = re.compile(r'(\d+)\s*requests?\s*per\s*(minute|hour|day)', re.IGNORECASE)
+    
+    # Plain mentions of scraping or automated access; matched case-insensitively
+    # so the page never has to be copied into lowercase
+    scraping_mention_pattern = re.compile(r'scraping|crawling', re.IGNORECASE)
+    automated_pattern = re.compile(r'automated', re.IGNORECASE)
+    prohibited_pattern = re.compile(r'prohibited', re.IGNORECASE)
+    
+    # Home page links to a terms page, e.g. href="/help/policies/user-agreement"
+    tos_link_pattern = re.compile(
+        rb'href=["\']([^"\']*(?:terms|\btos\b|user-agreement|conditions)[^"\']*)["\']', re.IGNORECASE
+    )
+    
+    # Only the start of an oversized ToS page is downloaded and scanned
+    max_tos_bytes = 1024 * 1024
+    
+    # Sites checked at once by check_sites
+    max_concurrent_checks = 10
+    
+    # Completed checks are reused for this many seconds
+    compliance_cache_ttl = 3600
+    
+    # Requests give up after total seconds, or sooner when a host won't accept a
+    # connection or stops sending mid-response, so a dead site fails fast
+    request_timeout = aiohttp.ClientTimeout(total=15, sock_connect=3, sock_read=5)
+    robots_timeout = aiohttp.ClientTimeout(total=10, sock_connect=3, sock_read=5)
+    
+    # Recommendation texts, built once rather than on every check
+    robots_disallowed_recommendation = "⚠️  Robots.txt disallows scraping - consider requesting permission"
+    crawl_delay_recommendation = "🕒 Respect crawl delay of {} seconds between requests"
+    tos_concerns_recommendation = "⚠️  Terms of Service contain scraping restrictions - review carefully"
+    rate_limits_recommendation = "📊 Rate limits specified - implement appropriate throttling"
+    allowed_recommendation = "✅ Scraping appears to be allowed with proper rate limiting"
+    general_recommendations = (
+        "🤝 Always respect website resources and consider API alternatives",
+        "📧 Consider contacting site owner for permission if unclear"
+    )
+    
+    # Guidelines by lowercased site name, read-only and shared by every checker
+    site_guidelines = MappingProxyType({
+        'ebay': (
+            "✅ eBay generally allows scraping for personal research use",
+            "⚠️  Commercial use may require API access or permission",
+            "🕒 Respect rate limits - max 1 request per 2 seconds recommended",
+            "📋 Review eBay's Developer Program for API alternatives",
+            "🎯 Focus on publicly available listing data only"
+        ),
+        'facebook': (
+            "🚫 Facebook has strict anti-scraping measures",
+            "🔐 Requires authentication which may violate ToS",
+            "⚠️  High risk of IP blocking and account restrictions",
+            "📱 Consider Facebook Marketing API for legitimate use cases",
+            "🤖 Automated access is generally prohibited"
+        ),
+        'gumtree': (
+            "✅ Generally more permissive for personal use scraping",
+            "⚠️  Respect robots.txt directives",
+            "🕒 Use reasonable delays between requests",
+            "📧 Consider contacting for commercial use permission",
+            "🏢 Avoid overloading their servers"
+        )
+    })
+    default_guidelines = (
+        "📋 Check robots.txt and Terms of Service",
+        "🕒 Use appropriate request delays",
+        "🤝 Respect website resources and bandwidth",
+        "📧 Consider contacting site owners for permission"
+    )
+
     def __init__(self):
         self.logger = logging.getLogger(__name__)
+        self.session: Optional[aiohttp.ClientSession] = None
         
-        # Common ToS violation indicators
-        self.tos_red_flags = [
-            r'automated.*access.*prohibited',
-            r'scraping.*not.*allowed',
-            r'data.*mining.*forbidden',
-            r'bots.*prohibited',
-            r'crawling.*unauthorized',
-            r'systematic.*downloading.*prohibited',
-            r'robots.*not.*permitted',
-            r'harvesting.*data.*illegal'
-        ]
+        # Results per site URL with the monotonic time they were checked. Each site
+        # has a lock so concurrent callers wait for one check instead of repeating it
+        self._compliance_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._site_locks: Dict[str, asyncio.Lock] = {}
+
+    async def __aenter__(self):
+        """Async context manager entry"""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit"""
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the shared session, if one was opened"""
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Session shared by every check, opened on first use so robots.txt and ToS
+        requests to a site reuse the same keep-alive connections
+        """
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                timeout=self.request_timeout,
+                connector=aiohttp.TCPConnector(limit=50, limit_per_host=4, ttl_dns_cache=300)
+            )
+        return self.session
+
+    async def check_sites(self, sites: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Check several sites concurrently, at most max_concurrent_checks at a time
+        Takes site names mapped to base URLs; results keep the same order
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrent_checks)
         
-        # Rate limiting indicators
-        self.rate_limit_indicators = [
-            r'rate.*limit',
-            r'requests.*per.*minute',
-            r'api.*throttling',
-            r'excessive.*requests'
-        ]
+        async def check(url: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.check_site_compliance(url)
+        
+        results = await asyncio.gather(*(check(url) for url in sites.values()))
+        return dict(zip(sites, results))
 
     async def check_site_compliance(self, base_url: str) -> Dict[str, Any]:
         """
         Comprehensive compliance check for a website
-        Returns analysis of robots.txt, ToS, and scraping policies
+        Returns analysis of robots.txt, ToS, and scraping policies. Successful
+        results are cached for compliance_cache_ttl seconds
         """
+        lock = self._site_locks.get(base_url)
+        if lock is None:
+            lock = self._site_locks[base_url] = asyncio.Lock()
+        
+        async with lock:
+            cached = self._compliance_cache.get(base_url)
+            if cached and time.monotonic() - cached[0] < self.compliance_cache_ttl:
+                return cached[1]
+            
+            result = await self._check_site_compliance(base_url)
+            if 'error' not in result:
+                self._compliance_cache[base_url] = (time.monotonic(), result)
+            return result
+
+    async def _check_site_compliance(self, base_url: str) -> Dict[str, Any]:
+        """Run the robots.txt and ToS checks for a website"""
         self.logger.info(f"Checking compliance for {base_url}")
         
         result = {
@@ -87,47 +303,82 @@ class ComplianceChecker:
         
         try:
             # Fetch robots.txt content
-            async with aiohttp.ClientSession() as session:
-                async with session.get(robots_url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                    if response.status == 200:
-                        content = await response.text()
-                        result['raw_content'] = content
-                        
-                        # Parse with urllib robotparser
-                        rp = RobotFileParser()
-                        rp.set_url(robots_url)
-                        rp.read()
-                        
-                        # Check general access
-                        result['allowed'] = rp.can_fetch('*', base_url)
-                        
-                        # Extract crawl delay
-                        delay_match = re.search(r'crawl-delay:\s*(\d+)', content, re.IGNORECASE)
-                        if delay_match:
-                            result['crawl_delay'] = int(delay_match.group(1))
-                        
-                        # Extract disallowed paths
-                        disallow_matches = re.findall(r'disallow:\s*([^\s]+)', content, re.IGNORECASE)
-                        result['disallowed_paths'] = disallow_matches
-                        
-                        # Check for user-agent specific rules
-                        user_agents = re.findall(r'user-agent:\s*([^\s]+)', content, re.IGNORECASE)
-                        for ua in set(user_agents):
-                            if ua != '*':
-                                result['user_agent_specific'][ua] = rp.can_fetch(ua, base_url)
+            session = self._get_session()
+            async with session.get(robots_url, timeout=self.robots_timeout) as response:
+                if response.status == 200:
+                    content = await response.text()
+                    result['raw_content'] = content
+                    
+                    lines = content.splitlines()
+                    can_fetch = self._robots_can_fetch(robots_url, content, lines)
+                    
+                    # Check general access
+                    result['allowed'] = can_fetch('*', base_url)
+                    
+                    # Crawl delay, disallowed paths and user-agent specific rules
+                    crawl_delay, disallowed_paths, user_agents = self._parse_robots_directives(lines)
+                    result['crawl_delay'] = crawl_delay
+                    result['disallowed_paths'] = disallowed_paths
+                    for ua in user_agents:
+                        if ua != '*':
+                            result['user_agent_specific'][ua] = can_fetch(ua, base_url)
+                
+                elif response.status == 404:
+                    result['allowed'] = True  # No robots.txt means allowed
+                    self.logger.info(f"No robots.txt found at {robots_url} - assuming allowed")
+                else:
+                    self.logger.warning(f"HTTP {response.status} when fetching {robots_url}")
                     
-                    elif response.status == 404:
-                        result['allowed'] = True  # No robots.txt means allowed
-                        self.logger.info(f"No robots.txt found at {robots_url} - assuming allowed")
-                    else:
-                        self.logger.warning(f"HTTP {response.status} when fetching {robots_url}")
-                        
         except Exception as e:
             self.logger.error(f"Failed to check robots.txt for {base_url}: {e}")
             result['allowed'] = True  # Assume allowed if we can't check
         
         return result
 
+    @staticmethod
+    def _robots_can_fetch(robots_url: str, content: str, lines: List[str]) -> Callable[[str, str], bool]:
+        """
+        can_fetch(user_agent, url) for a downloaded robots.txt, parsed by Protego when
+        installed, otherwise by urllib's RobotFileParser. The file is parsed as given;
+        RobotFileParser.read() would fetch it a second time, blocking the event loop
+        """
+        if Protego is not None:
+            rules = Protego.parse(content)
+            return lambda user_agent, url: rules.can_fetch(url, user_agent)
+        
+        rp = RobotFileParser(robots_url)
+        rp.parse(lines)
+        return rp.can_fetch
+
+    @staticmethod
+    def _parse_robots_directives(lines: List[str]) -> Tuple[Optional[int], List[str], List[str]]:
+        """
+        Crawl delay (the first one given), disallowed paths and user agents named
+        in robots.txt, collected in one pass over its lines
+        """
+        crawl_delay = None
+        disallowed_paths = []
+        user_agents = {}
+        
+        for line in lines:
+            key, _, value = line.partition(':')
+            key = key.strip().lower()
+            value = value.split(None, 1)
+            if not value:
+                continue
+            value = value[0]
+            
+            if key == 'disallow':
+                disallowed_paths.append(value)
+            elif key == 'user-agent':
+                user_agents[value] = None
+            elif key == 'crawl-delay' and crawl_delay is None:
+                digits = len(value) - len(value.lstrip('0123456789'))
+                if digits:
+                    crawl_delay = int(value[:digits])
+        
+        return crawl_delay, disallowed_paths, list(user_agents)
+
     async def _analyze_terms_of_service(self, base_url: str) -> Dict[str, Any]:
         """Analyze Terms of Service for scraping restrictions"""
         
@@ -143,130 +394,187 @@ class ComplianceChecker:
             '/legal/terms', '/help/terms', '/policies/terms'
         ]
         
-        async with aiohttp.ClientSession() as session:
-            for path in tos_paths:
-                tos_url = urljoin(base_url, path)
-                
-                try:
-                    async with session.get(tos_url, timeout=aiohttp.ClientTimeout(total=15)) as response:
-                        if response.status == 200:
-                            content = await response.text()
-                            result['tos_urls_checked'].append(tos_url)
-                            
-                            # Analyze content for restrictions
-                            concerns = self._extract_tos_concerns(content)
-                            result['concerns'].extend(concerns)
-                            
-                            # Look for rate limiting info
-                            rate_limits = self._extract_rate_limits(content)
-                            result['rate_limits'].extend(rate_limits)
-                            
-                            break  # Found ToS, no need to check others
-                            
-                except Exception as e:
-                    self.logger.debug(f"Could not fetch {tos_url}: {e}")
+        # Every candidate is probed with HEAD at once, then the first one (in list
+        # order) that exists is downloaded; later probes are cancelled
+        session = self._get_session()
+        tos_urls = [urljoin(base_url, path) for path in tos_paths]
+        probes = [asyncio.create_task(self._probe_url(session, tos_url)) for tos_url in tos_urls]
+        
+        try:
+            for tos_url, probe in zip(tos_urls, probes):
+                # Servers that don't support HEAD still get a GET
+                if await probe not in (200, 405, 501):
                     continue
+                if await self._analyze_tos_page(session, tos_url, result):
+                    break  # Found ToS, no need to check others
+        finally:
+            for probe in probes:
+                probe.cancel()
+        
+        # Sites with the ToS somewhere else usually link to it from the home page
+        if not result['tos_urls_checked']:
+            tos_url = await self._find_tos_link(session, base_url)
+            if tos_url:
+                await self._analyze_tos_page(session, tos_url, result)
         
         if not result['tos_urls_checked']:
             self.logger.warning(f"Could not find Terms of Service for {base_url}")
         
         return result
 
+    async def _analyze_tos_page(self, session: aiohttp.ClientSession, tos_url: str, result: Dict[str, Any]) -> bool:
+        """Download a ToS page and add its findings to result; False if it couldn't be fetched"""
+        try:
+            async with session.get(tos_url, timeout=self.request_timeout) as response:
+                if response.status != 200:
+                    return False
+                content = await self._read_text(response, self.max_tos_bytes)
+        except Exception as e:
+            self.logger.debug(f"Could not fetch {tos_url}: {e}")
+            return False
+        
+        result['tos_urls_checked'].append(tos_url)
+        
+        # Analyze content for restrictions
+        concerns = self._extract_tos_concerns(content)
+        result['concerns'].extend(concerns)
+        
+        # Look for rate limiting info
+        rate_limits = self._extract_rate_limits(content)
+        result['rate_limits'].extend(rate_limits)
+        
+        return True
+
+    @staticmethod
+    async def _read_text(response: aiohttp.ClientResponse, limit: int) -> str:
+        """Response body decoded as text, reading no more than limit bytes of it"""
+        body = bytearray()
+        async for chunk in response.content.iter_chunked(65536):
+            body += chunk
+            if len(body) >= limit:
+                break
+        return body[:limit].decode(response.charset or 'utf-8', errors='replace')
+
+    async def _find_tos_link(self, session: aiohttp.ClientSession, base_url: str) -> Optional[str]:
+        """Absolute URL of the first ToS-looking link on the site's home page, or None"""
+        try:
+            async with session.get(base_url, timeout=self.request_timeout) as response:
+                if response.status != 200:
+                    return None
+                # Matched on the raw bytes; only the link itself is decoded
+                match = self.tos_link_pattern.search(await response.read())
+        except Exception as e:
+            self.logger.debug(f"Could not fetch {base_url}: {e}")
+            return None
+        
+        if not match:
+            return None
+        return urljoin(str(response.url), html.unescape(match.group(1).decode('utf-8', errors='replace')))
+
+    async def _probe_url(self, session: aiohttp.ClientSession, url: str) -> Optional[int]:
+        """HTTP status of a HEAD request for url, or None if the request failed"""
+        try:
+            async with session.head(url, allow_redirects=True, timeout=self.request_timeout) as response:
+                return response.status
+        except Exception as e:
+            self.logger.debug(f"Could not fetch {url}: {e}")
+            return None
+
     def _extract_tos_concerns(self, tos_content: str) -> List[str]:
         """Extract scraping-related concerns from ToS content"""
         concerns = []
-        content_lower = tos_content.lower()
         
-        for pattern in self.tos_red_flags:
-            matches = re.findall(pattern, content_lower, re.IGNORECASE)
-            if matches:
-                concerns.append(f"ToS restriction found: {pattern}")
+        found = self._find_word_sequences(self.tos_red_flag_database, self.tos_red_flag_patterns, tos_content)
+        for concern, flag_found in zip(self.tos_red_flag_concerns, found):
+            if flag_found:
+                concerns.append(concern)
         
         # Look for specific scraping mentions
-        if 'scraping' in content_lower or 'crawling' in content_lower:
-            concerns.append("Terms explicitly mention scraping/crawling restrictions")
+        if self.scraping_mention_pattern.search(tos_content):
+            concerns.append(self.scraping_mention_concern)
         
-        if 'automated' in content_lower and 'prohibited' in content_lower:
-            concerns.append("Automated access appears to be prohibited")
+        if self.automated_pattern.search(tos_content) and self.prohibited_pattern.search(tos_content):
+            concerns.append(self.automated_prohibited_concern)
         
-        return list(set(concerns))  # Remove duplicates
+        return concerns
 
     def _extract_rate_limits(self, content: str) -> List[str]:
         """Extract rate limiting information from content"""
         rate_limits = []
-        content_lower = content.lower()
         
-        for pattern in self.rate_limit_indicators:
-            if re.search(pattern, content_lower, re.IGNORECASE):
-                rate_limits.append(f"Rate limiting mentioned: {pattern}")
+        found = self._find_word_sequences(self.rate_limit_database, self.rate_limit_patterns, content)
+        for mention, indicator_found in zip(self.rate_limit_mentions, found):
+            if indicator_found:
+                rate_limits.append(mention)
         
-        # Look for specific rate numbers
-        rate_matches = re.findall(r'(\d+)\s*requests?\s*per\s*(minute|hour|day)', content_lower)
+        # Look for specific rate numbers; interned, as the same few limits recur
+        # across pages and sites
+        rate_matches = self.rate_number_pattern.findall(content)
         for count, period in rate_matches:
-            rate_limits.append(f"Rate limit: {count} requests per {period}")
+            rate_limits.append(sys.intern(f"Rate limit: {count} requests per {period.lower()}"))
         
         return rate_limits
 
-    def _generate_recommendations(self, compliance_result: Dict[str, Any]) -> List[str]:
-        """Generate scraping recommendations based on compliance analysis"""
-        recommendations = []
+    @staticmethod
+    def _find_word_sequences(database, patterns: Tuple[Tuple[re.Pattern, ...], ...], text: str) -> List[bool]:
+        """Which of a set of word sequences text contains, by Hyperscan database when there is one"""
+        if database is None:
+            return [_contains_word_sequence(pattern, text) for pattern in patterns]
         
-        # Robots.txt recommendations
-        if not compliance_result['robots_allowed']:
-            recommendations.append("⚠️  Robots.txt disallows scraping - consider requesting permission")
+        found = [False] * len(patterns)
         
-        if compliance_result['robots_details'].get('crawl_delay'):
-            delay = compliance_result['robots_details']['crawl_delay']
-            recommendations.append(f"🕒 Respect crawl delay of {delay} seconds between requests")
+        def on_match(sequence_id, start, end, flags, context):
+            found[sequence_id] = True
         
-        # ToS recommendations
-        if compliance_result['tos_concerns']:
-            recommendations.append("⚠️  Terms of Service contain scraping restrictions - review carefully")
-        
-        if compliance_result['rate_limits']:
-            recommendations.append("📊 Rate limits specified - implement appropriate throttling")
-        
-        # General recommendations
-        if compliance_result['robots_allowed'] and not compliance_result['tos_concerns']:
-            recommendations.append("✅ Scraping appears to be allowed with proper rate limiting")
-        
-        recommendations.append("🤝 Always respect website resources and consider API alternatives")
-        recommendations.append("📧 Consider contacting site owner for permission if unclear")
+        database.scan(text.encode(), match_event_handler=on_match)
+        return found
+
+    def _generate_recommendations(self, compliance_result: Dict[str, Any]) -> List[str]:
+        """Generate scraping recommendations based on compliance analysis"""
+        robots_allowed = compliance_result['robots_allowed']
+        crawl_delay = compliance_result['robots_details'].get('crawl_delay')
+        tos_concerns = compliance_result['tos_concerns']
         
-        return recommendations
+        return [
+            rec for rec in (
+                # Robots.txt recommendations
+                None if robots_allowed else self.robots_disallowed_recommendation,
+                self.crawl_delay_recommendation.format(crawl_delay) if crawl_delay else None,
+                # ToS recommendations
+                self.tos_concerns_recommendation if tos_concerns else None,
+                self.rate_limits_recommendation if compliance_result['rate_limits'] else None,
+                # General recommendations
+                self.allowed_recommendation if robots_allowed and not tos_concerns else None
+            ) if rec
+        ] + list(self.general_recommendations)
 
     def save_compliance_report(self, results: Dict[str, Dict[str, Any]], output_path: str) -> None:
         """Save compliance analysis to a text report"""
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write("GPU SCRAPER - COMPLIANCE ANALYSIS REPORT\n")
-                f.write("=" * 50 + "\n\n")
+            parts = ["GPU SCRAPER - COMPLIANCE ANALYSIS REPORT\n", "=" * 50, "\n\n"]
+            
+            for site_name, result in results.items():
+                parts.append(f"SITE: {site_name.upper()}\n{'-' * 30}\n")
                 
-                for site_name, result in results.items():
-                    f.write(f"SITE: {site_name.upper()}\n")
-                    f.write("-" * 30 + "\n")
-                    
-                    if 'error' in result:
-                        f.write(f"❌ Error: {result['error']}\n\n")
-                        continue
-                    
-                    f.write(f"Robots.txt Allowed: {'✅ Yes' if result['robots_allowed'] else '❌ No'}\n")
-                    
-                    if result['tos_concerns']:
-                        f.write(f"⚠️  ToS Concerns ({len(result['tos_concerns'])}):\n")
-                        for concern in result['tos_concerns']:
-                            f.write(f"  - {concern}\n")
-                    
-                    if result['rate_limits']:
-                        f.write(f"📊 Rate Limits ({len(result['rate_limits'])}):\n")
-                        for limit in result['rate_limits']:
-                            f.write(f"  - {limit}\n")
-                    
-                    f.write("💡 Recommendations:\n")
-                    for rec in result['recommendations']:
-                        f.write(f"  - {rec}\n")
-                    
-                    f.write("\n")
+                if 'error' in result:
+                    parts.append(f"❌ Error: {result['error']}\n\n")
+                    continue
+                
+                parts.append(f"Robots.txt Allowed: {'✅ Yes' if result['robots_allowed'] else '❌ No'}\n")
+                
+                if result['tos_concerns']:
+                    parts.append(f"⚠️  ToS Concerns ({len(result['tos_concerns'])}):\n")
+                    parts.extend(f"  - {concern}\n" for concern in result['tos_concerns'])
+                
+                if result['rate_limits']:
+                    parts.append(f"📊 Rate Limits ({len(result['rate_limits'])}):\n")
+                    parts.extend(f"  - {limit}\n" for limit in result['rate_limits'])
+                
+                parts.append("💡 Recommendations:\n")
+                parts.extend(f"  - {rec}\n" for rec in result['recommendations'])
+                parts.append("\n")
+            
+            Path(output_path).write_text(''.join(parts), encoding='utf-8')
                 
             self.logger.info(f"Compliance report saved to {output_path}")
             
@@ -277,54 +585,23 @@ class ComplianceChecker:
         """
         Get site-specific scraping guidelines
         """
-        guidelines = {
-            'ebay': [
-                "✅ eBay generally allows scraping for personal research use",
-                "⚠️  Commercial use may require API access or permission",
-                "🕒 Respect rate limits - max 1 request per 2 seconds recommended",
-                "📋 Review eBay's Developer Program for API alternatives",
-                "🎯 Focus on publicly available listing data only"
-            ],
-            'facebook': [
-                "🚫 Facebook has strict anti-scraping measures",
-                "🔐 Requires authentication which may violate ToS",
-                "⚠️  High risk of IP blocking and account restrictions",
-                "📱 Consider Facebook Marketing API for legitimate use cases",
-                "🤖 Automated access is generally prohibited"
-            ],
-            'gumtree': [
-                "✅ Generally more permissive for personal use scraping",
-                "⚠️  Respect robots.txt directives",
-                "🕒 Use reasonable delays between requests",
-                "📧 Consider contacting for commercial use permission",
-                "🏢 Avoid overloading their servers"
-            ]
-        }
-        
-        return guidelines.get(site_name.lower(), [
-            "📋 Check robots.txt and Terms of Service",
-            "🕒 Use appropriate request delays",
-            "🤝 Respect website resources and bandwidth",
-            "📧 Consider contacting site owners for permission"
-        ])
+        return list(self.site_guidelines.get(site_name.lower(), self.default_guidelines))
 
 
 # Example usage for testing compliance checker
 async def test_compliance_checker():
     """Test the compliance checker with sample sites"""
-    checker = ComplianceChecker()
-    
     test_sites = {
         'ebay': 'https://www.ebay.co.uk',
         'gumtree': 'https://www.gumtree.com'
     }
     
-    results = {}
-    for name, url in test_sites.items():
-        print(f"Checking {name}...")
-        result = await checker.check_site_compliance(url)
-        results[name] = result
-        
+    print(f"Checking {', '.join(test_sites)}...")
+    async with ComplianceChecker() as checker:
+        results = await checker.check_sites(test_sites)
+    
+    for name, result in results.items():
+        print(f"{name}:")
         print(f"  Robots allowed: {result['robots_allowed']}")
         print(f"  ToS concerns: {len(result.get('tos_concerns', []))}")
         print(f"  Recommendations: {len(result.get('recommendations', []))}")
@@ -0,0 +1,78 @@
+"""
+Listing deduplication for GPU Scraper
+"""
+
+import hashlib
+import re
+from typing import Any, Dict, Tuple
+from urllib.parse import urlsplit
+
+try:
+    import xxhash
+except ImportError:  # Optional faster hashing
+    xxhash = None
+
+
+class Deduplicator:
+    """
+    Remembers which listings have been seen
+    Only a 64-bit hash of each listing's key is kept, so memory stays small on
+    long crawls, and the hash is the same from run to run. Listings are keyed by
+    marketplace item ID when the scraper sets one, otherwise by URL (without query
+    string or fragment, so tracking parameters don't matter), or by the start of
+    the title when there is no URL. Each kind of key has its own set of hashes
+    """
+
+    # Spacing and punctuation dropped from titles before comparing them
+    title_key_pattern = re.compile(r'[\W_]+')
+
+    def __init__(self):
+        self._seen: Dict[str, set] = {}
+
+    def __len__(self) -> int:
+        return sum(len(seen) for seen in self._seen.values())
+
+    def register(self, key: str, kind: str = 'key') -> bool:
+        """Record a key of the given kind; False if it had already been seen"""
+        seen = self._seen.get(kind)
+        if seen is None:
+            seen = self._seen[kind] = set()
+        key_hash = self.hash_key(key)
+        if key_hash in seen:
+            return False
+        seen.add(key_hash)
+        return True
+
+    def register_listing(self, listing: Dict[str, Any]) -> bool:
+        """Record a listing; False if it duplicates one already seen"""
+        kind, key = self.listing_key(listing)
+        return self.register(key, kind)
+
+    @classmethod
+    def listing_key(cls, listing: Dict[str, Any]) -> Tuple[str, str]:
+        """Kind and value of a listing's deduplication key"""
+        item_id = listing.get('item_id')
+        if item_id:
+            return 'item', item_id
+        url = listing.get('url')
+        if url:
+            return 'url', cls.normalize_url(url)
+        return 'title', cls.title_key(listing.get('title') or '')
+
+    @staticmethod
+    def hash_key(key: str) -> int:
+        """Stable 64-bit hash of a key; unlike hash(), not salted per process"""
+        if xxhash is not None:
+            return xxhash.xxh3_64_intdigest(key.encode())
+        return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'little')
+
+    @staticmethod
+    def normalize_url(url: str) -> str:
+        """URL with the host lowercased and any query string or fragment removed"""
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc.lower()}{parts.path}"
+
+    @classmethod
+    def title_key(cls, title: str) -> str:
+        """First 50 letters and digits of a title, lowercased"""
+        return cls.title_key_pattern.sub('', title.lower())[:50]
@@ -0,0 +1,18 @@
+"""
+Event loop setup for GPU Scraper entry points
+"""
+
+import asyncio
+from typing import Any, Coroutine
+
+try:
+    import uvloop
+except ImportError:  # Optional faster event loop
+    uvloop = None
+
+
+def run(main: Coroutine) -> Any:
+    """asyncio.run, on uvloop's event loop when it is installed"""
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return asyncio.run(main)